@@ -8,6 +8,7 @@ that can be used by both save-session.py and the git post-commit hook.
 Functions:
 - collect_git_changes() - Get file changes from git status
 - collect_git_commit_changes() - Get files from a specific commit
+- get_git_commit_info() - Get hash, message and files of a commit in one call
 - generate_resume_points() - Auto-generate resume points from changes
 - generate_next_steps() - Auto-generate next steps from changes
 - infer_session_description() - Generate description from file changes
@@ -18,7 +19,12 @@ Functions:
 """
 
 import json
+import os
+import shutil
 import subprocess
+import tempfile
+from collections import Counter
+from itertools import islice
 from datetime import datetime
 from pathlib import Path
 from typing import List, Dict, Optional
@@ -121,25 +127,71 @@ def collect_git_changes(base_dir: Path) -> List[Dict]:
     return changes
 
 
-def collect_git_commit_changes(base_dir: Path, commit_hash: Optional[str] = None) -> List[Dict]:
+def _parse_name_status(output: str) -> List[Dict]:
     """
-    Collect file changes from a specific git commit.
+    Parse `-z --name-status` output into file change dicts.
 
     Args:
-        base_dir: Base directory of git repository
-        commit_hash: Commit hash (defaults to HEAD)
+        output: NUL-separated '<status>' and '<path>' fields (renames off,
+            so every status is followed by exactly one path)
 
     Returns:
         List of file change dicts with 'file_path', 'action', 'source'
     """
     changes = []
 
+    fields = iter(output.split('\0'))
+    for status in fields:
+        # Fields are consumed lazily, one pair at a time
+        status = status.strip()
+        if not status:
+            continue
+        filepath = next(fields, '')
+        if not filepath:
+            continue
+
+        # Skip excluded paths
+        if _should_exclude_path(Path(filepath)):
+            continue
+
+        # Determine action
+        action = 'modified'
+        if status.startswith('A'):
+            action = 'created'
+        elif status.startswith('D'):
+            action = 'deleted'
+        elif status.startswith('M'):
+            action = 'modified'
+
+        changes.append({
+            'file_path': filepath,
+            'action': action,
+            'source': 'git-commit'
+        })
+
+    return changes
+
+
+def get_git_commit_info(base_dir: Path, commit_hash: Optional[str] = None) -> Optional[Dict]:
+    """
+    Get hash, message and changed files of a commit with a single git call.
+
+    Args:
+        base_dir: Base directory of git repository
+        commit_hash: Commit hash (defaults to HEAD)
+
+    Returns:
+        Dict with 'hash', 'message' and 'changes' (see collect_git_commit_changes),
+        or None if the commit can't be read
+    """
     try:
         commit = commit_hash or 'HEAD'
 
-        # Get files changed in commit
+        # Header fields are NUL-terminated, the NUL-separated name-status
+        # fields follow them (-z: paths come back unquoted, even non-ASCII)
         result = subprocess.run(
-            ['git', 'diff-tree', '--no-commit-tree', '--name-status', '-r', commit],
+            ['git', 'log', '-1', '-z', '--no-renames', '--name-status',
+             '--format=%H%x00%B%x00', commit],
             cwd=base_dir,
             capture_output=True,
             text=True,
@@ -147,43 +199,32 @@ def collect_git_commit_changes(base_dir: Path, commit_hash: Optional[str] = None
         )
 
         if result.returncode != 0:
-            return []
+            return None
 
-        # Parse diff-tree output
-        for line in result.stdout.strip().split('\n'):
-            if not line:
-                continue
-
-            parts = line.split('\t')
-            if len(parts) < 2:
-                continue
+        full_hash, message, name_status = result.stdout.split('\0', 2)
+        return {
+            'hash': full_hash.strip(),
+            'message': message.strip(),
+            'changes': _parse_name_status(name_status)
+        }
 
-            status = parts[0]
-            filepath = parts[1]
-
-            # Skip excluded paths
-            if _should_exclude_path(Path(filepath)):
-                continue
+    except (subprocess.TimeoutExpired, FileNotFoundError, ValueError):
+        return None
 
-            # Determine action
-            action = 'modified'
-            if status.startswith('A'):
-                action = 'created'
-            elif status.startswith('D'):
-                action = 'deleted'
-            elif status.startswith('M'):
-                action = 'modified'
 
-            changes.append({
-                'file_path': filepath,
-                'action': action,
-                'source': 'git-commit'
-            })
+def collect_git_commit_changes(base_dir: Path, commit_hash: Optional[str] = None) -> List[Dict]:
+    """
+    Collect file changes from a specific git commit.
 
-    except (subprocess.TimeoutExpired, FileNotFoundError):
-        pass
+    Args:
+        base_dir: Base directory of git repository
+        commit_hash: Commit hash (defaults to HEAD)
 
-    return changes
+    Returns:
+        List of file change dicts with 'file_path', 'action', 'source'
+    """
+    commit_info = get_git_commit_info(base_dir, commit_hash)
+    return commit_info['changes'] if commit_info else []
 
 
 def infer_session_description(changes: List[Dict]) -> str:
@@ -200,17 +241,9 @@ def infer_session_description(changes: List[Dict]) -> str:
         return "Work session"
 
     # Analyze file types and patterns
-    file_types = {}
-    directories = set()
-
-    for change in changes:
-        filepath = Path(change['file_path'])
-        ext = filepath.suffix.lower()
-        directory = filepath.parent
-
-        file_types[ext] = file_types.get(ext, 0) + 1
-        if directory != Path('.'):
-            directories.add(str(directory))
+    paths = [Path(change['file_path']) for change in changes]
+    file_types = Counter(filepath.suffix.lower() for filepath in paths)
+    directories = {str(filepath.parent) for filepath in paths if filepath.parent != Path('.')}
 
     # Generate description based on patterns
     descriptions = []
@@ -238,8 +271,7 @@ def infer_session_description(changes: List[Dict]) -> str:
 
     # Fallback: use directory names
     if directories:
-        dir_list = list(directories)[:2]
-        return f"Changes in {', '.join(dir_list)}"
+        return f"Changes in {', '.join(islice(directories, 2))}"
 
     return f"Modified {len(changes)} file(s)"
 
@@ -435,9 +467,25 @@ def update_checkpoint_with_git_info(checkpoint_path: Path, commit_hash: str,
         checkpoint_data['git_branch'] = branch
         checkpoint_data['git_remote_url'] = remote_url
 
-        # Write back
-        with open(checkpoint_path, 'w', encoding='utf-8') as f:
-            json.dump(checkpoint_data, f, indent=2, ensure_ascii=False)
+        # Write back atomically: write to temp file, then rename, so the
+        # session index or a resume never reads a half-written checkpoint
+        temp_fd, temp_path = tempfile.mkstemp(
+            dir=checkpoint_path.parent,
+            prefix=".checkpoint-",
+            suffix=".tmp"
+        )
+        try:
+            with os.fdopen(temp_fd, 'w', encoding='utf-8') as f:
+                json.dump(checkpoint_data, f, indent=2, ensure_ascii=False)
+
+            shutil.move(temp_path, checkpoint_path)
+        except Exception:
+            # Clean up temp file on error
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
+            raise
 
         return True
 
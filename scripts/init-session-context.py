@@ -32,19 +32,30 @@ DATE: 2026-01-15
 """
 
 import argparse
+import importlib.util
 import sys
 from pathlib import Path
 from typing import Dict, Any, Optional
-import platform
 
 # Add scripts directory to path for imports
 SCRIPTS_DIR = Path(__file__).parent
 sys.path.insert(0, str(SCRIPTS_DIR))
 
-# Check for Windows console compatibility
-IS_WINDOWS = platform.system() == "Windows"
+# Check for Windows console compatibility (sys.platform avoids importing
+# the platform module on every session start)
+IS_WINDOWS = sys.platform == "win32"
 USE_EMOJI = not IS_WINDOWS
 
+# Banner icons, fixed for the life of the process
+EMOJI_MAP = {
+    'task': '📋' if USE_EMOJI else '[Task]',
+    'mode': '🔧' if USE_EMOJI else '[Mode]',
+    'stats': '📊' if USE_EMOJI else '[Stats]',
+    'log': '📝' if USE_EMOJI else '[Log]',
+    'switch': '🔄' if USE_EMOJI else '[Switch]',
+    'tip': '💡' if USE_EMOJI else '[Tip]'
+}
+
 
 def print_welcome_banner(task_stack: Any, session_state: Any) -> None:
     """
@@ -54,14 +65,9 @@ def print_welcome_banner(task_stack: Any, session_state: Any) -> None:
         task_stack: Current task stack instance
         session_state: Current session state instance
     """
-    emoji_map = {
-        'task': '📋' if USE_EMOJI else '[Task]',
-        'mode': '🔧' if USE_EMOJI else '[Mode]',
-        'stats': '📊' if USE_EMOJI else '[Stats]',
-        'log': '📝' if USE_EMOJI else '[Log]',
-        'switch': '🔄' if USE_EMOJI else '[Switch]',
-        'tip': '💡' if USE_EMOJI else '[Tip]'
-    }
+    task_icon, mode_icon, stats_icon, log_icon, switch_icon, tip_icon = (
+        EMOJI_MAP[key] for key in ('task', 'mode', 'stats', 'log', 'switch', 'tip')
+    )
 
     print("\n" + "=" * 70)
     print(" " * 20 + "SESSION CONTEXT INITIALIZED")
@@ -71,18 +77,18 @@ def print_welcome_banner(task_stack: Any, session_state: Any) -> None:
     try:
         current = task_stack.current()
         if current:
-            print(f"\n{emoji_map['task']} Current Task: {current}")
+            print(f"\n{task_icon} Current Task: {current}")
         else:
-            print(f"\n{emoji_map['task']} No active task - starting fresh!")
+            print(f"\n{task_icon} No active task - starting fresh!")
     except Exception as e:
-        print(f"\n{emoji_map['task']} Task stack unavailable: {e}")
+        print(f"\n{task_icon} Task stack unavailable: {e}")
 
     # Session mode
     try:
         mode = getattr(session_state, 'mode', None) or "unknown"
-        print(f"{emoji_map['mode']} Session Mode: {mode}")
+        print(f"{mode_icon} Session Mode: {mode}")
     except Exception as e:
-        print(f"{emoji_map['mode']} Mode detection failed: {e}")
+        print(f"{mode_icon} Mode detection failed: {e}")
 
     # Quick stats
     try:
@@ -90,13 +96,13 @@ def print_welcome_banner(task_stack: Any, session_state: Any) -> None:
         decisions = getattr(session_state, 'decisions', [])
         context_switches = getattr(session_state, 'context_switches', [])
 
-        print(f"{emoji_map['stats']} Recent Tasks: {len(recent_tasks)}")
-        print(f"{emoji_map['log']} Decisions Logged: {len(decisions)}")
-        print(f"{emoji_map['switch']} Context Switches: {len(context_switches)}")
+        print(f"{stats_icon} Recent Tasks: {len(recent_tasks)}")
+        print(f"{log_icon} Decisions Logged: {len(decisions)}")
+        print(f"{switch_icon} Context Switches: {len(context_switches)}")
     except Exception as e:
-        print(f"{emoji_map['stats']} Stats unavailable: {e}")
+        print(f"{stats_icon} Stats unavailable: {e}")
 
-    print(f"\n{emoji_map['tip']} Tip: Use 'python scripts/task_stack.py show' to see task history")
+    print(f"\n{tip_icon} Tip: Use 'python scripts/task_stack.py show' to see task history")
     print("=" * 70 + "\n")
 
 
@@ -280,14 +286,14 @@ def show_status() -> None:
         'context_hooks': 'Tool Monitor'
     }
 
+    # Only locate each module on sys.path - importing it would run its
+    # top-level code just to print a health line
     for module_name, display_name in modules.items():
-        try:
-            __import__(module_name)
+        if importlib.util.find_spec(module_name) is not None:
             status = "OK" if USE_EMOJI else "[OK]"
-            print(f"  {status} {display_name}")
-        except ImportError:
+        else:
             status = "X" if USE_EMOJI else "[MISSING]"
-            print(f"  {status} {display_name}")
+        print(f"  {status} {display_name}")
 
     print("\n" + "=" * 70 + "\n")
 
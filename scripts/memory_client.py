@@ -11,12 +11,18 @@ Author: Context-Aware Memory System
 Date: 2025-12-23
 """
 
-import json
-import subprocess
+import os
 import time
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from pathlib import Path
 
+# json, tempfile and random are imported where they are used:
+# a hook that only hits the cached is_available() never needs them.
+
+# Shared encoder for streaming size estimates (same output as json.dumps),
+# created on first use
+_JSON_ENCODER = None
+
 
 class MemoryClient:
     """
@@ -26,6 +32,13 @@ class MemoryClient:
     with automatic retry logic and graceful error handling.
     """
 
+    # Availability probe result, shared by every client in the process and
+    # persisted to disk so short-lived hook processes can reuse it (see
+    # _availability_path)
+    _is_available_cache: Optional[bool] = None
+    _is_available_cache_time: float = 0
+    _is_available_cache_ttl: int = 60  # 60 seconds
+
     def __init__(self, config: Optional[Dict[str, Any]] = None):
         """
         Initialize memory client
@@ -36,46 +49,110 @@ class MemoryClient:
                 - query_timeout_seconds: int (default: 3)
                 - retry_attempts: int (default: 2)
                 - retry_backoff_seconds: int (default: 1)
+                - total_budget_seconds: float (default: 2), wall-clock
+                  deadline for one operation, counted from its first attempt
+                  and including time spent in the calls themselves. No retry
+                  is started whose backoff would end past it, so with the
+                  defaults only one retry is ever made (backoff ~1s, then ~2s)
         """
         self.config = config or {}
         self.connection_timeout = self.config.get('connection_timeout_seconds', 5)
         self.query_timeout = self.config.get('query_timeout_seconds', 3)
         self.retry_attempts = self.config.get('retry_attempts', 2)
         self.retry_backoff = self.config.get('retry_backoff_seconds', 1)
-
-        # Cache availability check result for performance
-        self._is_available_cache: Optional[bool] = None
-        self._is_available_cache_time: float = 0
-        self._is_available_cache_ttl: int = 60  # 60 seconds
+        self.total_budget = self.config.get('total_budget_seconds', 2)
 
     def is_available(self) -> bool:
         """
         Check if MCP memory server is available
 
-        Uses cached result if within TTL (60 seconds).
+        Uses the cached result if within TTL (60 seconds), first from this
+        process and then from the availability file written by earlier
+        processes.
 
         Returns:
             True if server is reachable, False otherwise
         """
-        # Check cache
-        now = time.time()
-        if self._is_available_cache is not None and \
-           (now - self._is_available_cache_time) < self._is_available_cache_ttl:
-            return self._is_available_cache
-
-        # Test connection by trying to read graph
-        try:
-            result = self.read_graph()
-            available = result is not None
-        except Exception:
-            available = False
+        cls = MemoryClient
+
+        # Check in-process cache
+        now = time.monotonic()
+        if cls._is_available_cache is not None and \
+           (now - cls._is_available_cache_time) < self._is_available_cache_ttl:
+            return cls._is_available_cache
+
+        # Check result persisted by another process, which stays valid only
+        # for the rest of its TTL
+        persisted = self._read_availability_file()
+        if persisted is not None:
+            available, age = persisted
+            checked_at = now - age
+        else:
+            # Test connection by trying to read graph
+            try:
+                result = self.read_graph()
+                available = result is not None
+            except Exception:
+                available = False
+            self._write_availability_file(available)
+            checked_at = now
 
         # Cache result
-        self._is_available_cache = available
-        self._is_available_cache_time = now
+        cls._is_available_cache = available
+        cls._is_available_cache_time = checked_at
 
         return available
 
+    @staticmethod
+    def _availability_path() -> Path:
+        """Availability file, resolved on each use so it follows $HOME"""
+        return Path.home() / ".claude-memory" / ".availability"
+
+    def _read_availability_file(self) -> Optional[Tuple[bool, float]]:
+        """
+        Read the persisted availability result if it is still fresh
+
+        Returns:
+            (availability, age in seconds), or None if missing, stale or
+            unreadable
+        """
+        path = self._availability_path()
+        try:
+            age = max(0.0, time.time() - os.stat(path).st_mtime)
+            if age >= self._is_available_cache_ttl:
+                return None
+            with open(path, 'rb') as f:
+                flag = f.read(1)
+        except OSError:
+            return None
+
+        if flag == b'1':
+            return True, age
+        if flag == b'0':
+            return False, age
+        return None
+
+    def _write_availability_file(self, available: bool) -> None:
+        """Atomically persist an availability result for other processes"""
+        import tempfile
+
+        path = self._availability_path()
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=path.parent, prefix='.availability.')
+        except OSError:
+            return
+
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(b'1' if available else b'0')
+            os.replace(temp_path, path)
+        except OSError:
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
+
     def search_nodes(self, query: str, limit: int = 10) -> Optional[Dict[str, Any]]:
         """
         Search memory graph by query string
@@ -91,10 +168,7 @@ class MemoryClient:
             result = client.search_nodes("authentication decision")
             # Returns: {"entities": [...], "relations": [...]}
         """
-        return self._retry_operation(
-            lambda: self._call_mcp_tool('search_nodes', {'query': query}),
-            operation_name='search_nodes'
-        )
+        return self._retry_operation('search_nodes', {'query': query})
 
     def open_nodes(self, names: List[str]) -> Optional[Dict[str, Any]]:
         """
@@ -110,10 +184,7 @@ class MemoryClient:
             result = client.open_nodes(["checkpoint.py", "session-logger"])
             # Returns full entity data with all observations
         """
-        return self._retry_operation(
-            lambda: self._call_mcp_tool('open_nodes', {'names': names}),
-            operation_name='open_nodes'
-        )
+        return self._retry_operation('open_nodes', {'names': names})
 
     def read_graph(self) -> Optional[Dict[str, Any]]:
         """
@@ -129,10 +200,7 @@ class MemoryClient:
             result = client.read_graph()
             # Returns: {"entities": [...], "relations": [...]}
         """
-        return self._retry_operation(
-            lambda: self._call_mcp_tool('read_graph', {}),
-            operation_name='read_graph'
-        )
+        return self._retry_operation('read_graph', {})
 
     def create_entities(self, entities: List[Dict[str, Any]]) -> bool:
         """
@@ -154,10 +222,7 @@ class MemoryClient:
                 "observations": ["Decided to use JWT for authentication"]
             }])
         """
-        result = self._retry_operation(
-            lambda: self._call_mcp_tool('create_entities', {'entities': entities}),
-            operation_name='create_entities'
-        )
+        result = self._retry_operation('create_entities', {'entities': entities})
         return result is not None
 
     def add_observations(self, observations: List[Dict[str, Any]]) -> bool:
@@ -178,10 +243,7 @@ class MemoryClient:
                 "contents": ["Updated to use RS256 algorithm"]
             }])
         """
-        result = self._retry_operation(
-            lambda: self._call_mcp_tool('add_observations', {'observations': observations}),
-            operation_name='add_observations'
-        )
+        result = self._retry_operation('add_observations', {'observations': observations})
         return result is not None
 
     def estimate_tokens(self, result: Optional[Dict[str, Any]]) -> int:
@@ -196,12 +258,18 @@ class MemoryClient:
         Returns:
             Estimated token count (0 if result is None)
         """
+        global _JSON_ENCODER
+
         if result is None:
             return 0
 
-        # Convert to JSON string and estimate tokens
-        json_str = json.dumps(result)
-        char_count = len(json_str)
+        if _JSON_ENCODER is None:
+            import json
+            _JSON_ENCODER = json.JSONEncoder()
+
+        # Measure the JSON length chunk by chunk instead of building the
+        # whole string, which can be megabytes for read_graph()
+        char_count = sum(map(len, _JSON_ENCODER.iterencode(result)))
 
         # ~4 characters per token (conservative estimate)
         return char_count // 4
@@ -236,46 +304,59 @@ class MemoryClient:
             #       timeout=self.query_timeout,  # Enforce timeout
             #       capture_output=True
             #   )
-            # If using other async methods, ensure timeout is enforced
+            # If using other async methods, ensure timeout is enforced.
+            # Import the transport lazily here and surface its timeout as
+            # TimeoutError (e.g. raise TimeoutError from subprocess.TimeoutExpired)
 
             # Placeholder: Return empty result for now
             # This will be replaced with actual MCP tool invocation
             return {"entities": [], "relations": []}
 
-        except subprocess.TimeoutExpired:
+        except TimeoutError:
             print(f"[WARNING] MCP tool {tool_name} timed out after {self.query_timeout}s")
             return None
         except Exception as e:
             print(f"[ERROR] Error calling MCP tool {tool_name}: {e}")
             return None
 
-    def _retry_operation(self, operation, operation_name: str) -> Optional[Any]:
+    def _retry_operation(self, tool_name: str, params: Dict[str, Any]) -> Optional[Any]:
         """
-        Retry an operation with exponential backoff
+        Call an MCP tool, retrying with jittered exponential backoff
+
+        Gives up early once the next backoff would end past the deadline
+        (total_budget seconds of wall-clock time from the first attempt,
+        calls included), so a failing server can't stall a hook for the full
+        retry schedule.
 
         Args:
-            operation: Callable that returns result or raises exception
-            operation_name: Name for logging
+            tool_name: Name of MCP tool, also used for logging
+            params: Tool parameters
 
         Returns:
             Operation result or None on failure
         """
-        last_exception = None
+        deadline = time.monotonic() + self.total_budget
+        attempts = self.retry_attempts + 1
 
-        for attempt in range(self.retry_attempts + 1):
+        for attempt in range(attempts):
             try:
-                return operation()
+                return self._call_mcp_tool(tool_name, params)
             except Exception as e:
-                last_exception = e
-                if attempt < self.retry_attempts:
-                    # Exponential backoff
-                    sleep_time = self.retry_backoff * (2 ** attempt)
-                    time.sleep(sleep_time)
-                    continue
-                else:
+                if attempt == attempts - 1:
                     # Final attempt failed
-                    print(f"Error in {operation_name} after {self.retry_attempts + 1} attempts: {last_exception}")
+                    print(f"Error in {tool_name} after {attempts} attempts: {e}")
+                    return None
+
+                import random
+
+                # Exponential backoff with +/-10% jitter so hooks firing
+                # together don't retry in lockstep
+                sleep_time = self.retry_backoff * (2 ** attempt) * random.uniform(0.9, 1.1)
+                if sleep_time > deadline - time.monotonic():
+                    print(f"Error in {tool_name} after {attempt + 1} attempts "
+                          f"(retry budget of {self.total_budget}s exhausted): {e}")
                     return None
+                time.sleep(sleep_time)
 
         return None
 
@@ -11,12 +11,16 @@ Date: 2025-12-23
 
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from typing import Optional, Dict, Any, List
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple, Union
 
 
-@dataclass
+@dataclass(frozen=True)
 class TriggerResult:
     """Result from a trigger detector evaluation"""
+    # Explicit slots (rather than dataclass(slots=True)) keep Python 3.8 support;
+    # valid because no field has a default value
+    __slots__ = ('triggered', 'confidence', 'estimated_tokens', 'query_type',
+                 'query_params', 'reason')
 
     triggered: bool
     """Whether this detector triggered"""
@@ -36,6 +40,16 @@ class TriggerResult:
     reason: str
     """Human-readable explanation of why this triggered"""
 
+    # Frozen slotted instances have no __dict__ and reject setattr, so copy
+    # and pickle need their state spelled out (dataclass(slots=True) adds
+    # the same pair)
+    def __getstate__(self) -> Tuple[Any, ...]:
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __setstate__(self, state: Tuple[Any, ...]) -> None:
+        for name, value in zip(self.__slots__, state):
+            object.__setattr__(self, name, value)
+
     def __str__(self) -> str:
         """String representation for logging"""
         return (f"TriggerResult(triggered={self.triggered}, "
@@ -122,17 +136,38 @@ class MemoryDetector(ABC):
         return f"{self.__class__.__name__}(name={self.name}, enabled={self.enabled}, priority={self.priority})"
 
 
+class _PendingDetector:
+    """Placeholder for a detector that is created on first use"""
+
+    __slots__ = ('name', 'priority', 'factory')
+
+    def __init__(self, name: str, priority: int,
+                 factory: Callable[[], Optional[MemoryDetector]]):
+        self.name = name
+        self.priority = priority
+        self.factory = factory
+
+
 class DetectorRegistry:
     """
     Registry for managing detector instances
 
     Provides methods to register, retrieve, and list detectors.
     Detectors are sorted by priority (lower number = higher priority).
+
+    Detectors registered with register_lazy() are only imported and
+    created when evaluation first reaches them (or they are looked up).
+
+    The enabled detectors are cached between calls, so toggle a registered
+    detector with set_enabled() rather than assigning detector.enabled.
     """
 
     def __init__(self):
         """Initialize empty registry"""
-        self._detectors: List[MemoryDetector] = []
+        self._by_name: Dict[str, Union[MemoryDetector, _PendingDetector]] = {}
+        self._sorted_cache: Optional[List[Union[MemoryDetector, _PendingDetector]]] = None
+        self._enabled_cache: Optional[Tuple[MemoryDetector, ...]] = None
+        self._pending: Set[str] = set()
 
     def register(self, detector: MemoryDetector) -> None:
         """
@@ -144,29 +179,124 @@ class DetectorRegistry:
         Args:
             detector: MemoryDetector instance
         """
-        # Check for duplicate and remove if exists
-        existing = self.get_detector(detector.name)
-        if existing:
-            self._detectors = [d for d in self._detectors if d.name != detector.name]
+        self._insert(detector.name, detector)
 
-        # Add new detector
-        self._detectors.append(detector)
+    def register_lazy(self, name: str, priority: int,
+                      factory: Callable[[], Optional[MemoryDetector]]) -> None:
+        """
+        Register an enabled detector without creating it yet
 
-        # Sort by priority (lower number = higher priority)
-        self._detectors.sort(key=lambda d: d.priority)
+        Args:
+            name: Name the detector will report
+            priority: Priority the detector will have
+            factory: Creates the detector, or returns None if it can't be
+                loaded (the entry is then dropped)
+        """
+        self._insert(name, _PendingDetector(name, priority, factory))
+
+    def _insert(self, name: str, entry: Union[MemoryDetector, _PendingDetector]) -> None:
+        """Add or replace an entry by name"""
+        # Re-insert so a replacement sorts after same-priority detectors,
+        # as if it had been appended
+        self._by_name.pop(name, None)
+        self._by_name[name] = entry
+        if isinstance(entry, _PendingDetector):
+            self._pending.add(name)
+        else:
+            self._pending.discard(name)
+        self._invalidate()
+
+    def _materialize(self, entry: Union[MemoryDetector, _PendingDetector]) -> Optional[MemoryDetector]:
+        """Create a pending detector in place; real detectors pass through"""
+        if not isinstance(entry, _PendingDetector):
+            return entry
+
+        detector = entry.factory()
+        if self._by_name.get(entry.name) is entry:
+            self._pending.discard(entry.name)
+            if detector is None:
+                del self._by_name[entry.name]
+            else:
+                # Same key, so the detector keeps its registration order
+                self._by_name[entry.name] = detector
+            self._invalidate()
+        return detector
+
+    def set_enabled(self, name: str, enabled: bool) -> bool:
+        """
+        Enable or disable a registered detector
 
-    def get_enabled_detectors(self) -> List[MemoryDetector]:
+        Args:
+            name: Detector name
+            enabled: New enabled state
+
+        Returns:
+            True if the detector exists, False otherwise
+        """
+        detector = self.get_detector(name)
+        if detector is None:
+            return False
+        if detector.enabled != enabled:
+            detector.enabled = enabled
+            self._enabled_cache = None
+        return True
+
+    def _invalidate(self) -> None:
+        """Drop the cached orderings after the set of detectors changes"""
+        self._sorted_cache = None
+        self._enabled_cache = None
+
+    def _sorted_detectors(self) -> List[Union[MemoryDetector, _PendingDetector]]:
+        """All entries by priority (lower number = higher priority), built on first use"""
+        if self._sorted_cache is None:
+            self._sorted_cache = sorted(self._by_name.values(), key=lambda d: d.priority)
+        return self._sorted_cache
+
+    def iter_enabled_detectors(self) -> Iterator[MemoryDetector]:
+        """
+        Yield enabled detectors in priority order, creating pending ones
+        only when reached
+
+        Lets a caller that stops at the first trigger skip importing the
+        remaining detectors.
+        """
+        if not self._pending:
+            yield from self.get_enabled_detectors()
+            return
+
+        for entry in self._sorted_detectors():
+            detector = self._materialize(entry)
+            if detector is not None and detector.is_enabled():
+                yield detector
+
+    def get_enabled_detectors(self) -> Tuple[MemoryDetector, ...]:
         """
         Get all enabled detectors in priority order
 
+        Creates any pending detectors. Called on every prompt, so the
+        filtered result is cached until a detector is registered or toggled.
+
         Returns:
-            List of enabled MemoryDetector instances
+            Tuple of enabled MemoryDetector instances
+        """
+        if self._enabled_cache is None:
+            detectors = [self._materialize(entry) for entry in self._sorted_detectors()]
+            self._enabled_cache = tuple(d for d in detectors if d is not None and d.is_enabled())
+        return self._enabled_cache
+
+    def count_enabled(self) -> int:
+        """
+        Count enabled detectors without creating pending ones
+
+        Pending detectors count as enabled, since only enabled detectors
+        are registered lazily.
         """
-        return [d for d in self._detectors if d.is_enabled()]
+        return sum(1 for d in self._by_name.values()
+                   if isinstance(d, _PendingDetector) or d.is_enabled())
 
     def get_detector(self, name: str) -> Optional[MemoryDetector]:
         """
-        Get detector by name
+        Get detector by name, creating it if it is still pending
 
         Args:
             name: Detector name
@@ -174,10 +304,10 @@ class DetectorRegistry:
         Returns:
             MemoryDetector instance or None if not found
         """
-        for detector in self._detectors:
-            if detector.name == name:
-                return detector
-        return None
+        entry = self._by_name.get(name)
+        if entry is None:
+            return None
+        return self._materialize(entry)
 
     def list_detectors(self) -> List[str]:
         """
@@ -186,15 +316,17 @@ class DetectorRegistry:
         Returns:
             List of detector names in priority order
         """
-        return [d.name for d in self._detectors]
+        return [d.name for d in self._sorted_detectors()]
 
     def clear(self) -> None:
         """Clear all registered detectors"""
-        self._detectors.clear()
+        self._by_name.clear()
+        self._pending.clear()
+        self._invalidate()
 
     def __len__(self) -> int:
         """Number of registered detectors"""
-        return len(self._detectors)
+        return len(self._by_name)
 
     def __repr__(self) -> str:
         """String representation"""
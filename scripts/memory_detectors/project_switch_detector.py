@@ -28,6 +28,10 @@ except ImportError:
     from project_tracker import ProjectTracker
 
 
+# Branches whose switch triggers a memory query unless configured otherwise
+DEFAULT_MAJOR_BRANCHES = frozenset(['main', 'master', 'develop', 'development'])
+
+
 class ProjectSwitchDetector(MemoryDetector):
     """
     Detector for project context switches
@@ -47,7 +51,7 @@ class ProjectSwitchDetector(MemoryDetector):
                 - priority: int - Detector priority (default: 1, highest)
                 - enabled: bool - Whether detector is enabled
                 - detect_branch_switch: bool - Detect branch changes (default: True)
-                - major_branches: List[str] - Branches that trigger on switch (default: main, master, develop)
+                - major_branches: Iterable[str] - Branches that trigger on switch (default: main, master, develop, development)
         """
         super().__init__(config)
 
@@ -57,7 +61,8 @@ class ProjectSwitchDetector(MemoryDetector):
 
         # Configuration options
         self.detect_branch_switch = config.get('detect_branch_switch', True)
-        self.major_branches = config.get('major_branches', ['main', 'master', 'develop', 'development'])
+        # Only used for membership tests, so keep it as a set
+        self.major_branches = frozenset(config.get('major_branches', DEFAULT_MAJOR_BRANCHES))
 
         # Initialize project tracker
         self.tracker = ProjectTracker()
@@ -15,11 +15,17 @@ Author: Context-Aware Memory System
 Date: 2025-12-23
 """
 
+import os
 import sys
 import json
-import argparse
 from pathlib import Path
-from typing import Optional, Dict, Any
+from types import SimpleNamespace
+from typing import Optional, Dict, Any, List
+
+try:
+    import ijson  # Optional: stream large hook payloads from stdin
+except ImportError:
+    ijson = None
 
 # Add scripts directory to path
 scripts_dir = Path(__file__).parent
@@ -29,6 +35,43 @@ from memory_trigger_engine import MemoryTriggerEngine
 from memory_detectors import MemoryDetector, TriggerResult
 
 
+def _stream_user_prompt(stream) -> Any:
+    """
+    Find the top-level user_prompt in a JSON object streamed with ijson
+
+    Only the prompt value is built; everything else in the payload (chat
+    history, file context) is skipped event by event, and reading stops
+    once the prompt has been read.
+
+    Args:
+        stream: Binary file object holding the JSON payload
+
+    Returns:
+        The user_prompt value, as json.load would give it, or '' if absent
+
+    Raises:
+        ValueError: If the payload is not a JSON object
+    """
+    events = ijson.parse(stream, use_float=True)
+    _, event, _ = next(events)
+    if event != 'start_map':
+        raise ValueError(f"expected a JSON object, got {event}")
+
+    for prefix, event, value in events:
+        if prefix == '' and event == 'map_key' and value == 'user_prompt':
+            builder = ijson.ObjectBuilder()
+            depth = 0
+            for _, event, value in events:
+                builder.event(event, value)
+                if event in ('start_map', 'start_array'):
+                    depth += 1
+                elif event in ('end_map', 'end_array'):
+                    depth -= 1
+                if depth == 0:
+                    return builder.value
+    return ''
+
+
 def parse_stdin_json() -> Optional[str]:
     """
     Parse user prompt from stdin JSON (for hook integration)
@@ -41,10 +84,17 @@ def parse_stdin_json() -> Optional[str]:
       ...
     }
 
+    With ijson installed the payload is streamed (see _stream_user_prompt),
+    with the same results as json.load except that a duplicated
+    user_prompt key yields its first value, and bytes after the prompt are
+    not checked.
+
     Returns:
         User prompt string or None
     """
     try:
+        if ijson is not None:
+            return _stream_user_prompt(sys.stdin.buffer)
         data = json.load(sys.stdin)
         return data.get('user_prompt', '')
     except Exception as e:
@@ -122,8 +172,15 @@ def load_detectors(engine: MemoryTriggerEngine, config: Dict[str, Any]) -> None:
             print(f"[ERROR] Failed to initialize token_threshold_detector: {e}")
 
 
-def main():
-    """Main entry point"""
+# Hook invocations only ever use these; anything else goes through argparse
+_FLAG_ARGS = {'--stdin': 'stdin', '--stats': 'stats', '--test': 'test'}
+_VALUE_ARGS = {'--prompt': ('prompt', str), '--config': ('config', Path), '--context': ('context', str)}
+
+
+def build_parser():
+    """Build the full argparse parser (help text and error reporting)"""
+    import argparse
+
     parser = argparse.ArgumentParser(
         description='Context-Aware Memory Trigger System',
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -150,17 +207,49 @@ Examples:
     parser.add_argument('--config', type=Path, help='Path to config file')
     parser.add_argument('--context', type=str, help='Context hint (checkpoint, threshold, etc.)')
 
-    args = parser.parse_args()
+    return parser
 
-    # Initialize engine
-    try:
-        engine = MemoryTriggerEngine(config_path=args.config)
-    except Exception as e:
-        print(f"[ERROR] Failed to initialize engine: {e}", file=sys.stderr)
-        sys.exit(1)
 
-    # Handle stats mode
+def parse_args(argv: List[str]):
+    """
+    Parse command-line arguments
+
+    The plain flag/value forms used by hooks are read directly, so the common
+    path skips importing and building argparse. Help, abbreviations, unknown
+    arguments and malformed values fall back to the full parser.
+
+    Args:
+        argv: Arguments without the program name
+
+    Returns:
+        Namespace with prompt, stdin, stats, test, config and context
+    """
+    args = SimpleNamespace(prompt=None, stdin=False, stats=False, test=False, config=None, context=None)
+    it = iter(argv)
+    for arg in it:
+        if arg in _FLAG_ARGS:
+            setattr(args, _FLAG_ARGS[arg], True)
+            continue
+        option = _VALUE_ARGS.get(arg)
+        value = next(it, None) if option else None
+        if value is None or value.startswith('-'):
+            return build_parser().parse_args(argv)
+        setattr(args, option[0], option[1](value))
+    return args
+
+
+def main():
+    """Main entry point"""
+    args = parse_args(sys.argv[1:])
+
+    # Handle stats mode (no log file or memory client needed)
     if args.stats:
+        try:
+            engine = MemoryTriggerEngine(config_path=args.config, stats_only=True)
+        except Exception as e:
+            print(f"[ERROR] Failed to initialize engine: {e}", file=sys.stderr)
+            sys.exit(1)
+
         stats = engine.get_stats()
         print("\n=== Memory Trigger Statistics ===")
         print(f"Session ID: {stats['session_id']}")
@@ -175,7 +264,7 @@ Examples:
     if args.test:
         print("[TEST MODE] Detector evaluation only, no MCP calls")
 
-    # Determine prompt
+    # Determine prompt before paying for engine setup
     prompt = None
     if args.stdin:
         prompt = parse_stdin_json()
@@ -184,13 +273,22 @@ Examples:
     elif args.prompt:
         prompt = args.prompt
     else:
-        parser.print_help()
+        build_parser().print_help()
+        sys.exit(1)
+
+    # Initialize engine
+    try:
+        engine = MemoryTriggerEngine(config_path=args.config)
+    except Exception as e:
+        print(f"[ERROR] Failed to initialize engine: {e}", file=sys.stderr)
         sys.exit(1)
 
-    # Load detectors
-    load_detectors(engine, engine.config)
+    # Detectors are auto-registered by the engine; load_detectors() is only
+    # the fallback for an engine that registered none
+    if len(engine.registry) == 0:
+        load_detectors(engine, engine.config)
 
-    if engine.registry.get_enabled_detectors() == 0:
+    if len(engine.registry) == 0:
         print("[WARNING] No detectors registered")
         sys.exit(0)
 
@@ -232,14 +330,15 @@ Examples:
                 "additionalContext": output,
                 "continue": True
             }
-            print(json.dumps(hook_output))
+            print(json.dumps(hook_output, separators=(',', ':')))
 
         sys.exit(0)
 
     except Exception as e:
         print(f"[ERROR] Trigger evaluation failed: {e}", file=sys.stderr)
-        import traceback
-        traceback.print_exc()
+        if os.environ.get('MEMTRIG_DEBUG'):
+            import traceback
+            traceback.print_exc()
         sys.exit(1)
 
 
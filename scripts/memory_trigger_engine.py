@@ -10,6 +10,7 @@ Date: 2025-12-23
 """
 
 import json
+import os
 import time
 import uuid
 import logging
@@ -17,9 +18,25 @@ from logging.handlers import RotatingFileHandler
 from pathlib import Path
 from typing import Dict, List, Optional, Any
 from datetime import datetime
+from functools import partial
 
 from memory_detectors import MemoryDetector, TriggerResult, DetectorRegistry
-from memory_client import MemoryClient
+
+# Number of recent trigger events kept in the state file; the total is
+# tracked separately in state['triggers_count']
+MAX_TRIGGER_HISTORY = 50
+
+# Memory query for each trigger query_type: (client, query_params) -> result.
+# The client is passed per call rather than bound into the table, so the
+# lazily created memory client is only built once a query actually runs
+QUERY_DISPATCH = {
+    'keyword_search': lambda client, params: client.search_nodes(params.get('query', '')),
+    'entity_details': lambda client, params: client.open_nodes(params.get('names', [])),
+    # Search for project-related entities
+    'project_context': lambda client, params: client.search_nodes(f"project:{params.get('project', '')}"),
+    # Search for pending/incomplete items
+    'threshold_check': lambda client, params: client.search_nodes("status:pending OR status:incomplete"),
+}
 
 
 class MemoryTriggerEngine:
@@ -30,38 +47,76 @@ class MemoryTriggerEngine:
     and token budget enforcement.
     """
 
-    def __init__(self, config_path: Optional[Path] = None):
+    def __init__(self, config_path: Optional[Path] = None, stats_only: bool = False):
         """
         Initialize trigger engine
 
         Args:
             config_path: Path to configuration JSON file
                         Defaults to .claude/memory-trigger-config.json
+            stats_only: Skip the rotating log file, for callers that only
+                        need get_stats() (the engine is otherwise complete)
         """
-        # Determine paths
-        self.home_dir = Path.home()
-        self.claude_dir = self.home_dir / '.claude'
-        self.config_path = config_path or (self.claude_dir / 'memory-trigger-config.json')
-        self.state_path = self.claude_dir / 'memory-trigger-state.json'
+        self._init_paths(config_path)
+        # One timestamp per invocation, shared by new session state and context
+        self._now_iso = datetime.now().isoformat()
 
         # Load configuration
         self.config = self._load_config()
 
         # Initialize components
         self.registry = DetectorRegistry()
-        self.memory_client = MemoryClient(self.config.get('mcp', {}))
+        self._memory_client = None  # Created on first use, see memory_client
 
         # Load session state
         self.state = self._load_state()
 
+        # Values that don't change while this engine evaluates prompts
+        self._base_context = {
+            'timestamp': self._now_iso,
+            'cwd': str(Path.cwd())
+        }
+        budget = self.config['budget']
+        self._max_tokens = budget['max_tokens_per_session']
+        self._max_tokens_per_trigger = budget.get('max_tokens_per_trigger')
+
         # Setup logging
-        self._setup_logging()
+        self._setup_logging(log_to_file=not stats_only)
 
         # Auto-register detectors from config
         self._initialize_detectors()
 
-    def _setup_logging(self):
-        """Configure rotating file logger for debugging and monitoring"""
+    @property
+    def memory_client(self):
+        """
+        MCP memory client, imported and created on first access
+
+        Most invocations never query memory (no trigger fires, or --test),
+        so they skip the client entirely.
+        """
+        if self._memory_client is None:
+            from memory_client import MemoryClient
+            self._memory_client = MemoryClient(self.config.get('mcp', {}))
+        return self._memory_client
+
+    @memory_client.setter
+    def memory_client(self, client) -> None:
+        self._memory_client = client
+
+    def _init_paths(self, config_path: Optional[Path]) -> None:
+        """Determine config and state file paths"""
+        self.home_dir = Path.home()
+        self.claude_dir = self.home_dir / '.claude'
+        self.config_path = config_path or (self.claude_dir / 'memory-trigger-config.json')
+        self.state_path = self.claude_dir / 'memory-trigger-state.json'
+
+    def _setup_logging(self, log_to_file: bool = True):
+        """
+        Configure rotating file logger for debugging and monitoring
+
+        Args:
+            log_to_file: If False, log records are discarded
+        """
         log_config = self.config.get('logging', {})
         log_level_name = log_config.get('level', 'INFO')
         log_level = getattr(logging, log_level_name, logging.INFO)
@@ -74,14 +129,23 @@ class MemoryTriggerEngine:
         self.logger.setLevel(log_level)
 
         # Clear existing handlers to avoid duplicates
+        for old_handler in self.logger.handlers:
+            old_handler.close()
         self.logger.handlers = []
 
-        # Rotating file handler
-        log_file.parent.mkdir(parents=True, exist_ok=True)
+        if not log_to_file or not log_config.get('enabled', True):
+            self.logger.addHandler(logging.NullHandler())
+            return
+
+        # Rotating file handler; delay=True leaves the file unopened until
+        # a record is actually emitted, so quiet runs never touch it
+        if not log_file.parent.is_dir():
+            log_file.parent.mkdir(parents=True, exist_ok=True)
         handler = RotatingFileHandler(
             log_file,
             maxBytes=max_bytes,
-            backupCount=backup_count
+            backupCount=backup_count,
+            delay=True
         )
 
         # Format
@@ -91,7 +155,7 @@ class MemoryTriggerEngine:
         handler.setFormatter(formatter)
         self.logger.addHandler(handler)
 
-        self.logger.info("Memory trigger engine initialized")
+        self.logger.debug("Memory trigger engine initialized")
 
     def register_detector(self, detector: MemoryDetector) -> None:
         """
@@ -106,8 +170,10 @@ class MemoryTriggerEngine:
         """
         Auto-register detectors from configuration
 
-        Dynamically loads and registers detectors based on config['detectors'].
-        Handles import errors gracefully - missing detectors won't crash the engine.
+        Registers each detector enabled in config['detectors'] lazily: its
+        module is only imported, and the detector created, when evaluation
+        first reaches it. Import errors are logged at that point and the
+        detector is dropped - missing detectors won't crash the engine.
 
         Special handling:
         - EntityMentionDetector: Requires set_memory_client() call after instantiation
@@ -115,6 +181,7 @@ class MemoryTriggerEngine:
         detector_config = self.config.get('detectors', {})
 
         # Detector mapping: config_key -> (module_path, class_name, default_priority)
+        # Each module is named after the detector it defines
         DETECTOR_MAP = {
             'project_switch': ('memory_detectors.project_switch_detector', 'ProjectSwitchDetector', 1),
             'keyword': ('memory_detectors.keyword_detector', 'KeywordDetector', 2),
@@ -123,7 +190,6 @@ class MemoryTriggerEngine:
         }
 
         registered_count = 0
-        failed_count = 0
 
         for config_key, (module_path, class_name, default_priority) in DETECTOR_MAP.items():
             # Check if detector is enabled in config
@@ -132,32 +198,46 @@ class MemoryTriggerEngine:
                 self.logger.debug(f"Detector {config_key} is disabled, skipping")
                 continue
 
-            try:
-                # Dynamic import
-                module = __import__(module_path, fromlist=[class_name])
-                detector_class = getattr(module, class_name)
-
-                # Instantiate detector
-                detector = detector_class(detector_settings)
-
-                # Special handling for EntityMentionDetector
-                if config_key == 'entity_mention' and hasattr(detector, 'set_memory_client'):
-                    detector.set_memory_client(self.memory_client)
-                    self.logger.debug(f"Set memory client for {detector.name}")
-
-                # Register detector
-                self.registry.register(detector)
-                registered_count += 1
-                self.logger.info(f"Auto-registered detector: {detector.name}")
-
-            except ImportError as e:
-                self.logger.warning(f"Could not import {class_name}: {e}")
-                failed_count += 1
-            except Exception as e:
-                self.logger.error(f"Failed to initialize {class_name}: {e}")
-                failed_count += 1
+            # Pin the priority so the pending entry sorts where the detector will
+            priority = detector_settings.get('priority', default_priority)
+            detector_settings = dict(detector_settings, priority=priority)
+
+            name = module_path.rpartition('.')[2]
+            self.registry.register_lazy(name, priority, partial(
+                self._create_detector, config_key, module_path, class_name, detector_settings))
+            registered_count += 1
+            self.logger.debug(f"Auto-registered detector: {name}")
+
+        self.logger.debug(f"Detector auto-registration complete: {registered_count} registered")
+
+    def _create_detector(self, config_key: str, module_path: str, class_name: str,
+                         detector_settings: Dict[str, Any]) -> Optional[MemoryDetector]:
+        """
+        Import and instantiate an auto-registered detector
+
+        Returns:
+            The detector, or None if it could not be loaded
+        """
+        try:
+            # Dynamic import
+            module = __import__(module_path, fromlist=[class_name])
+            detector_class = getattr(module, class_name)
+
+            # Instantiate detector
+            detector = detector_class(detector_settings)
 
-        self.logger.info(f"Detector auto-registration complete: {registered_count} registered, {failed_count} failed")
+            # Special handling for EntityMentionDetector
+            if config_key == 'entity_mention' and hasattr(detector, 'set_memory_client'):
+                detector.set_memory_client(self.memory_client)
+                self.logger.debug(f"Set memory client for {detector.name}")
+
+            return detector
+
+        except ImportError as e:
+            self.logger.warning(f"Could not import {class_name}: {e}")
+        except Exception as e:
+            self.logger.error(f"Failed to initialize {class_name}: {e}")
+        return None
 
     def evaluate_triggers(self, prompt: str, context: Optional[Dict[str, Any]] = None) -> Optional[TriggerResult]:
         """
@@ -173,7 +253,7 @@ class MemoryTriggerEngine:
         Returns:
             TriggerResult from first triggered detector, or None
         """
-        self.logger.debug(f"Evaluating triggers for prompt: {prompt[:50]}...")
+        self.logger.debug("Evaluating triggers for prompt: %.50s...", prompt)
 
         # Build context
         if context is None:
@@ -181,15 +261,13 @@ class MemoryTriggerEngine:
 
         # Check token budget first
         if not self._check_budget():
-            msg = f"Token budget exhausted ({self.state['tokens_used']}/{self.config['budget']['max_tokens_per_session']})"
+            msg = f"Token budget exhausted ({self.state['tokens_used']}/{self._max_tokens})"
             self.logger.warning(msg)
             print(f"[WARNING] {msg}")
             return None
 
-        # Evaluate detectors in priority order
-        detectors = self.registry.get_enabled_detectors()
-
-        for detector in detectors:
+        # Evaluate detectors in priority order, loading each only when reached
+        for detector in self.registry.iter_enabled_detectors():
             try:
                 result = detector.evaluate(prompt, context)
 
@@ -206,9 +284,7 @@ class MemoryTriggerEngine:
 
             except Exception as e:
                 self.logger.error(f"Detector {detector.name} failed: {type(e).__name__}: {e}")
-                if self.logger.level == logging.DEBUG:
-                    import traceback
-                    self.logger.debug(traceback.format_exc())
+                self.logger.debug("Detector %s traceback:", detector.name, exc_info=True)
                 print(f"[ERROR] Detector {detector.name} failed: {e}")
                 continue
 
@@ -225,7 +301,7 @@ class MemoryTriggerEngine:
         Returns:
             Memory query result dict or None on error
         """
-        self.logger.debug(f"Querying memory: {trigger_result.query_type}")
+        self.logger.debug("Querying memory: %s", trigger_result.query_type)
 
         if not self.memory_client.is_available():
             self.logger.warning("MCP memory server unavailable")
@@ -237,17 +313,9 @@ class MemoryTriggerEngine:
 
         try:
             # Route to appropriate query method
-            if query_type == 'keyword_search':
-                result = self.memory_client.search_nodes(query_params.get('query', ''))
-            elif query_type == 'entity_details':
-                result = self.memory_client.open_nodes(query_params.get('names', []))
-            elif query_type == 'project_context':
-                # Search for project-related entities
-                project_name = query_params.get('project', '')
-                result = self.memory_client.search_nodes(f"project:{project_name}")
-            elif query_type == 'threshold_check':
-                # Search for pending/incomplete items
-                result = self.memory_client.search_nodes("status:pending OR status:incomplete")
+            query = QUERY_DISPATCH.get(query_type)
+            if query is not None:
+                result = query(self.memory_client, query_params)
             else:
                 msg = f"Unknown query type: {query_type}"
                 self.logger.warning(msg)
@@ -266,9 +334,7 @@ class MemoryTriggerEngine:
 
         except Exception as e:
             self.logger.error(f"Memory query failed: {type(e).__name__}: {e}")
-            if self.logger.level == logging.DEBUG:
-                import traceback
-                self.logger.debug(traceback.format_exc())
+            self.logger.debug("Memory query traceback:", exc_info=True)
             print(f"[ERROR] Memory query failed: {e}")
             return None
 
@@ -325,9 +391,9 @@ class MemoryTriggerEngine:
             'tokens_used': self.state.get('tokens_used', 0),
             'tokens_budget': self.config['budget']['max_tokens_per_session'],
             'tokens_remaining': self.config['budget']['max_tokens_per_session'] - self.state.get('tokens_used', 0),
-            'triggers_fired': len(self.state.get('triggers_fired', [])),
+            'triggers_fired': self.state.get('triggers_count', 0),
             'detectors_registered': len(self.registry),
-            'detectors_enabled': len(self.registry.get_enabled_detectors()),
+            'detectors_enabled': self.registry.count_enabled(),
         }
 
     def _load_config(self) -> Dict[str, Any]:
@@ -368,34 +434,60 @@ class MemoryTriggerEngine:
         if self.state_path.exists():
             try:
                 with open(self.state_path, 'r') as f:
-                    return json.load(f)
+                    state = json.load(f)
+                # Older state files kept every trigger and no counter
+                triggers = state.setdefault('triggers_fired', [])
+                state.setdefault('triggers_count', len(triggers))
+                del triggers[:-MAX_TRIGGER_HISTORY]
+                return state
             except Exception:
                 pass
 
         # New session state
         return {
             "session_id": str(uuid.uuid4()),
-            "session_start": datetime.now().isoformat(),
+            "session_start": self._now_iso,
             "tokens_used": 0,
+            "triggers_count": 0,
             "triggers_fired": []
         }
 
     def _save_state(self) -> None:
-        """Save session state to file"""
+        """Save session state to file (compact JSON, replaced atomically)"""
+        # Imported here: only invocations that change state pay for it
+        import tempfile
+
+        state_dir = self.state_path.parent
+        temp_path = None
         try:
-            self.state_path.parent.mkdir(parents=True, exist_ok=True)
-            with open(self.state_path, 'w') as f:
-                json.dump(self.state, f, indent=2)
+            data = json.dumps(self.state, separators=(',', ':'))
+            # A temp file unique to this process, so concurrent hooks never
+            # write into (or publish) each other's temp file
+            mkstemp = partial(tempfile.mkstemp, dir=state_dir,
+                              prefix='.memory-trigger-state.', suffix='.tmp')
+            try:
+                fd, temp_path = mkstemp()
+            except FileNotFoundError:
+                # First save on this machine; the directory usually exists
+                state_dir.mkdir(parents=True, exist_ok=True)
+                fd, temp_path = mkstemp()
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(data)
+            os.replace(temp_path, self.state_path)
         except Exception as e:
             print(f"[WARNING] Failed to save state: {e}")
+            if temp_path is not None:
+                try:
+                    os.unlink(temp_path)
+                except OSError:
+                    pass
 
     def _build_context(self) -> Dict[str, Any]:
         """Build context dict for detectors"""
         return {
+            **self._base_context,
             'session_id': self.state['session_id'],
-            'token_count': self.state.get('tokens_used', 0),
-            'timestamp': datetime.now().isoformat(),
-            'cwd': str(Path.cwd())
+            'token_count': self.state.get('tokens_used', 0)
         }
 
     def _check_budget(self, additional_tokens: int = 0) -> bool:
@@ -408,14 +500,11 @@ class MemoryTriggerEngine:
         Returns:
             True if within budget, False otherwise
         """
-        max_tokens = self.config['budget']['max_tokens_per_session']
-        max_tokens_per_trigger = self.config['budget'].get('max_tokens_per_trigger')
-        current_usage = self.state.get('tokens_used', 0)
-
+        max_tokens_per_trigger = self._max_tokens_per_trigger
         if max_tokens_per_trigger is not None and additional_tokens > max_tokens_per_trigger:
             return False
 
-        return (current_usage + additional_tokens) <= max_tokens
+        return (self.state.get('tokens_used', 0) + additional_tokens) <= self._max_tokens
 
     def _record_trigger(self, trigger_result: TriggerResult, actual_tokens: int) -> None:
         """
@@ -426,12 +515,16 @@ class MemoryTriggerEngine:
             actual_tokens: Actual token cost
         """
         self.state['tokens_used'] = self.state.get('tokens_used', 0) + actual_tokens
-        self.state['triggers_fired'].append({
+        self.state['triggers_count'] = self.state.get('triggers_count', 0) + 1
+        triggers = self.state.setdefault('triggers_fired', [])
+        triggers.append({
             'timestamp': datetime.now().isoformat(),
             'detector': trigger_result.query_type,
             'tokens': actual_tokens,
             'reason': trigger_result.reason
         })
+        if len(triggers) > MAX_TRIGGER_HISTORY:
+            del triggers[:-MAX_TRIGGER_HISTORY]
         self._save_state()
 
 
@@ -14,9 +14,12 @@ import json
 import os
 import subprocess
 import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+from itertools import islice
 from pathlib import Path
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, Iterator, List
 import importlib.util
 
 # Import session index
@@ -26,6 +29,37 @@ session_index = importlib.util.module_from_spec(spec_index)
 spec_index.loader.exec_module(session_index)
 SessionIndex = session_index.SessionIndex
 
+# Below this many checkpoints, loading them serially beats starting a pool
+PARALLEL_LOAD_MIN_FILES = 32
+
+# Checkpoints parsed ahead of the migration loop. Bounds how many loaded
+# (possibly MB-sized) checkpoints are held in memory at once
+PARALLEL_LOAD_WINDOW = 64
+
+# Default for _migrate_checkpoint(loaded=...): None already means "skip"
+_NOT_LOADED = object()
+
+
+def _load_checkpoint(path: str):
+    """
+    Load one checkpoint file (module-level so it can run in a worker process).
+
+    Checkpoints that already have project metadata come back as None, so
+    only the ones that need migrating are sent back to the parent.
+
+    Args:
+        path: Path to checkpoint JSON file
+
+    Returns:
+        Checkpoint dict, None if already migrated, or the exception raised
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            checkpoint = json.load(f)
+        return None if checkpoint.get('project') else checkpoint
+    except Exception as e:
+        return e
+
 
 class CheckpointMigrator:
     """Migrate old checkpoints to include project metadata"""
@@ -41,9 +75,28 @@ class CheckpointMigrator:
         self.failed_count = 0
         self.errors: List[str] = []
 
+        # Git info per project directory - a migration run sees the same few
+        # projects over and over, and each lookup costs git processes
+        self._git_info_cache: Dict[Path, Optional[Dict[str, str]]] = {}
+
     def _get_git_info(self, project_path: Path) -> Optional[Dict[str, str]]:
         """
-        Get git information for a project directory.
+        Get git information for a project directory (cached per directory).
+
+        Args:
+            project_path: Path to project directory
+
+        Returns:
+            Dict with remote_url, branch, head_hash, or None if not a git repo
+        """
+        key = project_path.resolve()
+        if key not in self._git_info_cache:
+            self._git_info_cache[key] = self._query_git_info(key)
+        return self._git_info_cache[key]
+
+    def _query_git_info(self, project_path: Path) -> Optional[Dict[str, str]]:
+        """
+        Ask git for a project directory's remote, branch and HEAD.
 
         Args:
             project_path: Path to project directory
@@ -52,16 +105,18 @@ class CheckpointMigrator:
             Dict with remote_url, branch, head_hash, or None if not a git repo
         """
         try:
-            # Check if it's a git repo
+            # One rev-parse answers "is it a repo", HEAD and the branch
+            # (prints "true", the hash, then the branch or "HEAD" if detached)
             result = subprocess.run(
-                ['git', 'rev-parse', '--is-inside-work-tree'],
+                ['git', 'rev-parse', '--is-inside-work-tree', 'HEAD', '--abbrev-ref', 'HEAD'],
                 cwd=project_path,
                 capture_output=True,
                 text=True,
                 timeout=5
             )
 
-            if result.returncode != 0:
+            lines = result.stdout.split()
+            if not lines or lines[0] != 'true':
                 return None
 
             git_info = {}
@@ -77,28 +132,22 @@ class CheckpointMigrator:
             if remote_result.returncode == 0:
                 git_info['remote_url'] = remote_result.stdout.strip()
 
-            # Get current branch
-            branch_result = subprocess.run(
-                ['git', 'branch', '--show-current'],
-                cwd=project_path,
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
-            if branch_result.returncode == 0:
+            # HEAD hash and current branch
+            if result.returncode == 0 and len(lines) == 3:
+                git_info['head_hash'] = lines[1]
+                git_info['branch'] = '' if lines[2] == 'HEAD' else lines[2]
+            else:
+                # rev-parse HEAD fails before the first commit, but the
+                # branch is still named by the symbolic ref
+                branch_result = subprocess.run(
+                    ['git', 'symbolic-ref', '--short', '-q', 'HEAD'],
+                    cwd=project_path,
+                    capture_output=True,
+                    text=True,
+                    timeout=5
+                )
                 git_info['branch'] = branch_result.stdout.strip()
 
-            # Get HEAD hash
-            hash_result = subprocess.run(
-                ['git', 'rev-parse', 'HEAD'],
-                cwd=project_path,
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
-            if hash_result.returncode == 0:
-                git_info['head_hash'] = hash_result.stdout.strip()
-
             return git_info if git_info else None
 
         except (subprocess.TimeoutExpired, FileNotFoundError, Exception):
@@ -128,34 +177,35 @@ class CheckpointMigrator:
             if paths:
                 # Find common ancestor directory
                 try:
-                    # Convert to absolute paths and find common parent
-                    abs_paths = [p.resolve() for p in paths if p.exists()]
-                    if abs_paths:
-                        # Find common parent directory
-                        common_parent = abs_paths[0].parent
-                        for p in abs_paths[1:]:
-                            # Walk up until we find common ancestor
-                            while not str(p).startswith(str(common_parent)):
-                                common_parent = common_parent.parent
-                                if common_parent == common_parent.parent:
-                                    # Reached root, can't find common parent
-                                    break
-
-                        # Verify it's a reasonable project directory (not home or root)
-                        if common_parent != Path.home() and common_parent != common_parent.parent:
-                            project_metadata = {
-                                'absolute_path': str(common_parent),
-                                'name': common_parent.name
-                            }
-
-                            # Try to get git info for this directory
-                            git_info = self._get_git_info(common_parent)
-                            if git_info:
-                                project_metadata['git_remote_url'] = git_info.get('remote_url')
-                                project_metadata['git_branch'] = git_info.get('branch')
-                                project_metadata['git_head_hash'] = git_info.get('head_hash')
-
-                            return project_metadata
+                    # Files still on disk place the project; a moved or stale
+                    # path elsewhere would pull the common directory up. If
+                    # none remain, the project directory itself may still
+                    # exist, so use them all
+                    existing = [p for p in paths if p.exists()] or paths
+
+                    # Common directory, compared by whole path components
+                    # (/a/foo is not a prefix of /a/foobar). Raises
+                    # ValueError for paths on different drives
+                    common_parent = Path(os.path.commonpath(
+                        [str(p.resolve().parent) for p in existing]
+                    ))
+
+                    # Verify it's a reasonable project directory (not home or root)
+                    if (common_parent.is_dir() and common_parent != Path.home()
+                            and common_parent != common_parent.parent):
+                        project_metadata = {
+                            'absolute_path': str(common_parent),
+                            'name': common_parent.name
+                        }
+
+                        # Try to get git info for this directory
+                        git_info = self._get_git_info(common_parent)
+                        if git_info:
+                            project_metadata['git_remote_url'] = git_info.get('remote_url')
+                            project_metadata['git_branch'] = git_info.get('branch')
+                            project_metadata['git_head_hash'] = git_info.get('head_hash')
+
+                        return project_metadata
                 except Exception:
                     pass
 
@@ -173,24 +223,67 @@ class CheckpointMigrator:
 
         return None
 
-    def _migrate_checkpoint(self, checkpoint_file: Path, dry_run: bool = False) -> bool:
+    def _load_checkpoints(self, checkpoint_files: List[Path]) -> Iterator[Any]:
+        """
+        Load checkpoint files, in parallel when there are many of them.
+
+        JSON parsing is CPU bound and independent per file. Project inference
+        and writes stay in this process so the git cache is shared and files
+        are written by one process only. Results are yielded as they arrive,
+        with at most PARALLEL_LOAD_WINDOW files loaded ahead of the caller.
+
+        Args:
+            checkpoint_files: Checkpoint JSON files to load
+
+        Yields:
+            _load_checkpoint() results in file order
+        """
+        paths = [str(f) for f in checkpoint_files]
+        done = 0
+
+        # A pool only pays for itself with several CPUs to spread parsing over
+        workers = os.cpu_count() or 1
+        if len(paths) >= PARALLEL_LOAD_MIN_FILES and workers >= 2:
+            try:
+                with ProcessPoolExecutor(max_workers=workers) as pool:
+                    queued = iter(paths)
+                    pending = deque(pool.submit(_load_checkpoint, path)
+                                    for path in islice(queued, PARALLEL_LOAD_WINDOW))
+                    while pending:
+                        result = pending.popleft().result()
+                        for path in islice(queued, 1):
+                            pending.append(pool.submit(_load_checkpoint, path))
+                        yield result
+                        done += 1
+            except Exception:
+                # Pool unavailable or broken (restricted platform, killed
+                # worker): load the rest here
+                pass
+
+        for path in paths[done:]:
+            yield _load_checkpoint(path)
+
+    def _migrate_checkpoint(self, checkpoint_file: Path, dry_run: bool = False,
+                            loaded: Any = _NOT_LOADED) -> bool:
         """
         Migrate a single checkpoint file.
 
         Args:
             checkpoint_file: Path to checkpoint JSON file
             dry_run: If True, don't write changes
+            loaded: Result of _load_checkpoint() for the file, if already loaded
 
         Returns:
             True if migrated, False if skipped or failed
         """
         try:
             # Load checkpoint
-            with open(checkpoint_file, 'r', encoding='utf-8') as f:
-                checkpoint = json.load(f)
+            checkpoint = _load_checkpoint(str(checkpoint_file)) if loaded is _NOT_LOADED else loaded
+            if isinstance(checkpoint, Exception):
+                raise checkpoint
 
             # Check if already has project metadata
-            if checkpoint.get('project'):
+            if checkpoint is None:
                 print(f"  ✓ Skipping {checkpoint_file.name} (already has project metadata)")
                 self.skipped_count += 1
                 return False
@@ -259,8 +352,9 @@ class CheckpointMigrator:
             print("DRY RUN MODE - No changes will be written")
         print()
 
-        for checkpoint_file in checkpoint_files:
-            self._migrate_checkpoint(checkpoint_file, dry_run=dry_run)
+        loaded = self._load_checkpoints(checkpoint_files)
+        for checkpoint_file, checkpoint in zip(checkpoint_files, loaded):
+            self._migrate_checkpoint(checkpoint_file, dry_run=dry_run, loaded=checkpoint)
 
         print("\n" + "="*70)
         print("MIGRATION SUMMARY")
@@ -22,7 +22,9 @@ Usage:
 import os
 import sys
 import json
+import signal
 import importlib.util
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional, Any
@@ -68,10 +70,17 @@ class PostCommitHandler:
         """
         self.base_dir = Path(base_dir) if base_dir else Path.cwd()
 
-    def get_project_metadata(self) -> Dict[str, Any]:
+    def get_project_metadata(self, remote_url: Optional[str] = None,
+                             branch: Optional[str] = None,
+                             head_hash: Optional[str] = None) -> Dict[str, Any]:
         """
         Collect project metadata for the current directory.
 
+        Args:
+            remote_url: Git remote URL, if already known
+            branch: Git branch, if already known
+            head_hash: HEAD commit hash, if already known
+
         Returns:
             Project metadata dict
         """
@@ -80,10 +89,16 @@ class PostCommitHandler:
             'name': self.base_dir.name
         }
 
-        # Add git info
-        metadata['git_remote_url'] = checkpoint_utils.get_git_remote_url(self.base_dir)
-        metadata['git_branch'] = checkpoint_utils.get_git_branch(self.base_dir)
-        metadata['git_head_hash'] = checkpoint_utils.get_git_commit_hash(self.base_dir)
+        # Add git info (only asking git for what the caller doesn't have)
+        if remote_url is None:
+            remote_url = checkpoint_utils.get_git_remote_url(self.base_dir)
+        if branch is None:
+            branch = checkpoint_utils.get_git_branch(self.base_dir)
+        if head_hash is None:
+            head_hash = checkpoint_utils.get_git_commit_hash(self.base_dir)
+        metadata['git_remote_url'] = remote_url
+        metadata['git_branch'] = branch
+        metadata['git_head_hash'] = head_hash
 
         return metadata
 
@@ -95,18 +110,24 @@ class PostCommitHandler:
             Checkpoint file path, or None if failed
         """
         try:
-            # Get commit information
-            commit_hash = checkpoint_utils.get_git_commit_hash(self.base_dir)
-            if not commit_hash:
+            # Get commit hash, message and file changes in one git call; the
+            # branch and remote lookups are independent of it, so the three
+            # git processes run concurrently
+            with ThreadPoolExecutor(max_workers=3) as executor:
+                commit_future = executor.submit(checkpoint_utils.get_git_commit_info, self.base_dir)
+                branch_future = executor.submit(checkpoint_utils.get_git_branch, self.base_dir)
+                remote_future = executor.submit(checkpoint_utils.get_git_remote_url, self.base_dir)
+
+            commit_info = commit_future.result()
+            if not commit_info or not commit_info['hash']:
                 print("Error: Could not get commit hash", file=sys.stderr)
                 return None
 
-            commit_message = checkpoint_utils.get_git_commit_message(self.base_dir, commit_hash)
-            branch = checkpoint_utils.get_git_branch(self.base_dir)
-            remote_url = checkpoint_utils.get_git_remote_url(self.base_dir)
-
-            # Collect file changes from commit
-            changes = checkpoint_utils.collect_git_commit_changes(self.base_dir, commit_hash)
+            commit_hash = commit_info['hash']
+            commit_message = commit_info['message']
+            changes = commit_info['changes']
+            branch = branch_future.result()
+            remote_url = remote_future.result()
 
             # Generate checkpoint content
             # Use commit message as description, or generate from changes
@@ -120,7 +141,7 @@ class PostCommitHandler:
             next_steps = checkpoint_utils.generate_next_steps(changes)
 
             # Collect project metadata
-            project_metadata = self.get_project_metadata()
+            project_metadata = self.get_project_metadata(remote_url, branch, commit_hash)
 
             # Initialize session logger
             logger = SessionLogger(base_dir=str(self.base_dir))
@@ -226,10 +247,30 @@ class PostCommitHandler:
             return 0  # Return 0 to not break git workflow
 
 
+def _on_timeout(signum, frame):
+    """Give up on the checkpoint when the hook's time budget runs out"""
+    print("\n⚠ Checkpoint creation timed out (commit succeeded)", file=sys.stderr)
+    sys.stderr.flush()
+    sys.stdout.flush()
+    # Worker threads may still be blocked; don't wait for them at exit
+    os._exit(0)
+
+
 def main():
     """Command-line interface for testing"""
-    handler = PostCommitHandler()
-    exit_code = handler.run()
+    # The hook sets POST_COMMIT_TIMEOUT when sh has no `timeout` command
+    timeout = int(os.environ.get('POST_COMMIT_TIMEOUT', '0') or 0)
+    if timeout > 0 and hasattr(signal, 'SIGALRM'):
+        signal.signal(signal.SIGALRM, _on_timeout)
+        signal.alarm(timeout)
+
+    try:
+        handler = PostCommitHandler()
+        exit_code = handler.run()
+    except Exception as e:
+        # run() catches its own errors; this covers setup failures
+        print(f"\n⚠ Post-commit hook error: {e} (commit succeeded)", file=sys.stderr)
+        exit_code = 0
     sys.exit(exit_code)
 
 
@@ -81,17 +81,17 @@ def generate_test_suggestions(dependencies: Dict[str, Dict]) -> List[str]:
     """
     suggestions = []
 
-    # Files with existing tests
+    # Files with existing tests, and untested files that matter (one pass)
     files_with_tests = []
-    files_without_tests = []
+    high_impact_no_tests = []
 
     for filepath, dep_dict in dependencies.items():
         dep = FileDependency(**dep_dict) if isinstance(dep_dict, dict) else dep_dict
 
         if dep.has_tests:
             files_with_tests.append(filepath)
-        else:
-            files_without_tests.append(filepath)
+        elif dep.impact_score >= 50:
+            high_impact_no_tests.append(filepath)
 
     # Suggest running tests for files with test coverage
     if files_with_tests:
@@ -101,19 +101,13 @@ def generate_test_suggestions(dependencies: Dict[str, Dict]) -> List[str]:
             preview = ', '.join(files_with_tests[:3])
             suggestions.append(f"Run tests for: {preview} (+{len(files_with_tests) - 3} more files)")
 
-    # Suggest writing tests for files without coverage
-    if files_without_tests:
-        high_impact_no_tests = [
-            f for f in files_without_tests
-            if dependencies[f].get('impact_score', 0) >= 50
-        ]
-
-        if high_impact_no_tests:
-            if len(high_impact_no_tests) <= 2:
-                suggestions.append(f"[!] Consider writing tests for: {', '.join(high_impact_no_tests)}")
-            else:
-                preview = ', '.join(high_impact_no_tests[:2])
-                suggestions.append(f"[!] Consider writing tests for: {preview} (+{len(high_impact_no_tests) - 2} more)")
+    # Suggest writing tests for high-impact files without coverage
+    if high_impact_no_tests:
+        if len(high_impact_no_tests) <= 2:
+            suggestions.append(f"[!] Consider writing tests for: {', '.join(high_impact_no_tests)}")
+        else:
+            preview = ', '.join(high_impact_no_tests[:2])
+            suggestions.append(f"[!] Consider writing tests for: {preview} (+{len(high_impact_no_tests) - 2} more)")
 
     return suggestions
 
@@ -132,15 +126,21 @@ def generate_impact_summary(dependencies: Dict[str, Dict]) -> List[str]:
 
     summary = []
 
-    # Count by impact level
-    high_impact = [f for f, d in dependencies.items() if d.get('impact_score', 0) >= 70]
-    medium_impact = [f for f, d in dependencies.items() if 50 <= d.get('impact_score', 0) < 70]
+    # Count by impact level in a single pass
+    high_impact = 0
+    medium_impact = 0
+    for d in dependencies.values():
+        score = d.get('impact_score', 0)
+        if score >= 70:
+            high_impact += 1
+        elif score >= 50:
+            medium_impact += 1
 
     # Overall summary
     if high_impact:
-        summary.append(f"--- Impact Analysis: {len(high_impact)} high-impact file(s), {len(medium_impact)} medium-impact ---")
+        summary.append(f"--- Impact Analysis: {high_impact} high-impact file(s), {medium_impact} medium-impact ---")
     elif medium_impact:
-        summary.append(f"--- Impact Analysis: {len(medium_impact)} medium-impact file(s) ---")
+        summary.append(f"--- Impact Analysis: {medium_impact} medium-impact file(s) ---")
     else:
         summary.append("--- Impact Analysis: Low-impact changes ---")
 
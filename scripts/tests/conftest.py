@@ -0,0 +1,36 @@
+"""
+Shared fixtures for the scripts test suite
+
+Keeps process-wide state from leaking between tests and out of the test run:
+every test gets a scratch home directory and an empty MemoryClient
+availability cache.
+
+Author: Context-Aware Memory System
+Date: 2026-10-16
+"""
+
+import pytest
+import sys
+from pathlib import Path
+
+# Add scripts directory to path
+scripts_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(scripts_dir))
+
+from memory_client import MemoryClient
+
+
+@pytest.fixture(autouse=True)
+def isolated_home(tmp_path_factory, monkeypatch):
+    """Point ~ at a scratch directory so nothing is written to the real home"""
+    home = tmp_path_factory.mktemp('home')
+    monkeypatch.setenv('HOME', str(home))
+    monkeypatch.setenv('USERPROFILE', str(home))
+    return home
+
+
+@pytest.fixture(autouse=True)
+def reset_availability_cache(monkeypatch):
+    """Start every test with an empty shared availability cache"""
+    monkeypatch.setattr(MemoryClient, '_is_available_cache', None)
+    monkeypatch.setattr(MemoryClient, '_is_available_cache_time', 0)
@@ -9,6 +9,7 @@ Date: 2025-12-29
 """
 
 import pytest
+import os
 import sys
 import time
 from pathlib import Path
@@ -123,8 +124,9 @@ class TestMemoryClient:
             # First call
             client.is_available()
 
-            # Mock time.time() to simulate TTL expiration
-            with patch('time.time', return_value=time.time() + 61):  # 61 seconds later
+            # Mock both clocks to simulate TTL expiration
+            with patch('time.monotonic', return_value=time.monotonic() + 61), \
+                 patch('time.time', return_value=time.time() + 61):  # 61 seconds later
                 # Second call (cache expired)
                 client.is_available()
 
@@ -142,6 +144,50 @@ class TestMemoryClient:
         assert result2 is False
         assert mock_read.call_count == 1  # Cached
 
+    def test_is_available_shared_across_clients(self, client):
+        """Test a probe by one client is reused by new clients"""
+        with patch.object(client, 'read_graph', return_value={'entities': []}):
+            assert client.is_available() is True
+
+        other = MemoryClient()
+        with patch.object(other, 'read_graph', return_value=None) as mock_read:
+            assert other.is_available() is True
+
+        mock_read.assert_not_called()
+
+    def test_is_available_reads_persisted_result(self, client, isolated_home):
+        """Test a fresh availability file skips the probe in a new process"""
+        with patch.object(client, 'read_graph', return_value=None):
+            client.is_available()
+
+        assert (isolated_home / '.claude-memory' / '.availability').read_bytes() == b'0'
+
+        # Simulate a new process: in-process cache is empty
+        MemoryClient._is_available_cache = None
+        with patch.object(client, 'read_graph', return_value={'entities': []}) as mock_read:
+            assert client.is_available() is False
+
+        mock_read.assert_not_called()
+
+    def test_is_available_persisted_result_expires_with_file(self, client, isolated_home):
+        """Test a persisted result is only reused for the rest of its TTL"""
+        avail_file = isolated_home / '.claude-memory' / '.availability'
+        avail_file.parent.mkdir(parents=True)
+        avail_file.write_bytes(b'1')
+        written = time.time() - 50
+        os.utime(avail_file, (written, written))
+
+        with patch.object(client, 'read_graph', return_value=None) as mock_read:
+            assert client.is_available() is True
+            mock_read.assert_not_called()
+
+            # 15 seconds on, the file result is 65 seconds old: probe again
+            with patch('time.monotonic', return_value=time.monotonic() + 15), \
+                 patch('time.time', return_value=time.time() + 15):
+                assert client.is_available() is False
+
+        assert mock_read.call_count == 1
+
     # ========== Search Nodes Tests ==========
 
     def test_search_nodes_calls_mcp_tool(self, client, mock_result):
@@ -332,8 +378,9 @@ class TestMemoryClient:
     def test_retry_operation_succeeds_on_first_attempt(self, client):
         """Test _retry_operation() returns immediately on success"""
         operation = Mock(return_value={'success': True})
+        client._call_mcp_tool = operation
 
-        result = client._retry_operation(operation, 'test_op')
+        result = client._retry_operation('test_op', {})
 
         assert result == {'success': True}
         assert operation.call_count == 1
@@ -342,8 +389,11 @@ class TestMemoryClient:
         """Test _retry_operation() retries when operation fails"""
         # Fail first 2 attempts, succeed on 3rd
         operation = Mock(side_effect=[Exception("Error"), Exception("Error"), {'success': True}])
+        client._call_mcp_tool = operation
+        client.total_budget = 10
 
-        result = client._retry_operation(operation, 'test_op')
+        with patch('time.sleep'):
+            result = client._retry_operation('test_op', {})
 
         assert result == {'success': True}
         assert operation.call_count == 3  # 1 initial + 2 retries
@@ -352,8 +402,11 @@ class TestMemoryClient:
         """Test _retry_operation() uses configured retry attempts"""
         # Fail all attempts
         operation = Mock(side_effect=Exception("Error"))
+        client_with_config._call_mcp_tool = operation
+        client_with_config.total_budget = 60
 
-        result = client_with_config._retry_operation(operation, 'test_op')
+        with patch('time.sleep'):
+            result = client_with_config._retry_operation('test_op', {})
 
         # Should try: 1 initial + 3 retries (from config) = 4 total
         assert operation.call_count == 4
@@ -362,9 +415,12 @@ class TestMemoryClient:
     def test_retry_operation_uses_exponential_backoff(self, client):
         """Test _retry_operation() uses exponential backoff between retries"""
         operation = Mock(side_effect=[Exception("Error"), Exception("Error"), {'success': True}])
+        client._call_mcp_tool = operation
+        client.total_budget = 10
 
-        with patch('time.sleep') as mock_sleep:
-            client._retry_operation(operation, 'test_op')
+        with patch('time.sleep') as mock_sleep, \
+             patch('random.uniform', return_value=1.0):
+            client._retry_operation('test_op', {})
 
         # Should sleep with exponential backoff: backoff * (2^attempt)
         # Attempt 0 fails → sleep(1 * 2^0) = 1
@@ -377,17 +433,63 @@ class TestMemoryClient:
     def test_retry_operation_returns_none_after_all_attempts_fail(self, client):
         """Test _retry_operation() returns None when all attempts fail"""
         operation = Mock(side_effect=Exception("Persistent error"))
+        client._call_mcp_tool = operation
+        client.total_budget = 10
 
-        result = client._retry_operation(operation, 'test_op')
+        with patch('time.sleep'):
+            result = client._retry_operation('test_op', {})
 
         assert result is None
         assert operation.call_count == 3  # 1 initial + 2 retries (default)
 
+    def test_retry_operation_jitters_backoff(self, client):
+        """Test _retry_operation() applies +/-10% jitter to each sleep"""
+        operation = Mock(side_effect=[Exception("Error"), {'success': True}])
+        client._call_mcp_tool = operation
+
+        with patch('time.sleep') as mock_sleep, \
+             patch('random.uniform', return_value=1.1) as mock_uniform:
+            client._retry_operation('test_op', {})
+
+        mock_uniform.assert_called_once_with(0.9, 1.1)
+        mock_sleep.assert_called_once_with(pytest.approx(1.1))
+
+    def test_retry_operation_stops_when_budget_exhausted(self, client, capsys):
+        """Test _retry_operation() gives up instead of sleeping past its budget"""
+        operation = Mock(side_effect=Exception("Persistent error"))
+        client._call_mcp_tool = operation
+
+        # Default budget (2s) covers the first backoff (~1s) but not the second (~2s)
+        with patch('time.sleep') as mock_sleep, \
+             patch('random.uniform', return_value=1.0):
+            result = client._retry_operation('test_op', {})
+
+        assert result is None
+        assert operation.call_count == 2
+        mock_sleep.assert_called_once_with(1)
+        assert 'retry budget' in capsys.readouterr().out
+
+    def test_retry_operation_budget_counts_time_in_calls(self, client):
+        """Test time spent in a slow failing call counts against the budget"""
+        operation = Mock(side_effect=Exception("Slow error"))
+        client._call_mcp_tool = operation
+
+        # The first call takes 1.5s of the 2s budget: no room for a ~1s backoff
+        with patch('time.monotonic', side_effect=[100.0, 101.5]), \
+             patch('time.sleep') as mock_sleep, \
+             patch('random.uniform', return_value=1.0):
+            result = client._retry_operation('test_op', {})
+
+        assert result is None
+        assert operation.call_count == 1
+        mock_sleep.assert_not_called()
+
     def test_retry_operation_prints_error_after_final_failure(self, client, capsys):
         """Test _retry_operation() prints error after exhausting retries"""
         operation = Mock(side_effect=Exception("Test error"))
+        client._call_mcp_tool = operation
 
-        client._retry_operation(operation, 'test_operation')
+        client._retry_operation('test_operation', {})
 
         captured = capsys.readouterr()
         assert 'Error in test_operation' in captured.out
@@ -410,7 +512,7 @@ class TestMemoryClient:
         # Patch to raise timeout, verify it's caught
         with patch.object(client, '_call_mcp_tool', side_effect=subprocess.TimeoutExpired(cmd='test', timeout=5)):
             # Call through _retry_operation which will catch the exception
-            result = client._retry_operation(lambda: client._call_mcp_tool('test_tool', {}), 'test')
+            result = client._retry_operation('test_tool', {})
 
         assert result is None
 
@@ -419,7 +521,7 @@ class TestMemoryClient:
         # Patch to raise exception, verify it's caught
         with patch.object(client, '_call_mcp_tool', side_effect=ValueError("Test error")):
             # Call through _retry_operation which will catch the exception
-            result = client._retry_operation(lambda: client._call_mcp_tool('test_tool', {}), 'test')
+            result = client._retry_operation('test_tool', {})
 
         assert result is None
 
@@ -452,7 +554,9 @@ class TestMemoryClient:
                 raise Exception("Transient error")
             return {'entities': []}
 
-        with patch.object(client, '_call_mcp_tool', side_effect=mock_call_mcp):
+        client.total_budget = 10
+        with patch.object(client, '_call_mcp_tool', side_effect=mock_call_mcp), \
+             patch('time.sleep'):
             result = client.open_nodes(['entity1'])
 
         assert result is not None
@@ -485,9 +589,10 @@ class TestMemoryClient:
         """Test _retry_operation() works with zero backoff time"""
         client = MemoryClient({'retry_backoff_seconds': 0})
         operation = Mock(side_effect=[Exception("Error"), {'success': True}])
+        client._call_mcp_tool = operation
 
         with patch('time.sleep') as mock_sleep:
-            result = client._retry_operation(operation, 'test_op')
+            result = client._retry_operation('test_op', {})
 
         # Should still retry but with 0 sleep time
         assert result == {'success': True}
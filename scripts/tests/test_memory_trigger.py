@@ -0,0 +1,115 @@
+"""
+Tests for Memory Trigger CLI
+
+Tests command-line argument parsing for the memory trigger entry point,
+including the argparse fallback, and reading the prompt from hook JSON on
+stdin with and without ijson.
+
+Author: Context-Aware Memory System
+Date: 2025-12-29
+"""
+
+import io
+import pytest
+import sys
+from pathlib import Path
+
+# Add scripts directory to path
+scripts_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(scripts_dir))
+
+import memory_trigger
+from memory_trigger import parse_args, build_parser
+
+
+class TestParseArgs:
+    """Test suite for parse_args"""
+
+    @pytest.mark.parametrize("argv", [
+        [],
+        ['--stdin'],
+        ['--prompt', 'Remember our decision?', '--test'],
+        ['--stats', '--config', '/tmp/config.json'],
+        ['--context', 'checkpoint', '--prompt', ''],
+        ['--prompt', 'first', '--prompt', 'second'],
+    ])
+    def test_matches_argparse(self, argv):
+        """Test the fast path gives the same values as the full parser"""
+        assert vars(parse_args(argv)) == vars(build_parser().parse_args(argv))
+
+    def test_config_is_path(self):
+        """Test --config is converted to a Path"""
+        args = parse_args(['--config', 'config.json'])
+
+        assert args.config == Path('config.json')
+
+    def test_unknown_argument_falls_back_to_argparse(self, capsys):
+        """Test unknown arguments are reported by argparse"""
+        with pytest.raises(SystemExit):
+            parse_args(['--bogus'])
+
+        assert 'unrecognized arguments: --bogus' in capsys.readouterr().err
+
+    def test_missing_value_falls_back_to_argparse(self, capsys):
+        """Test an option without its value is reported by argparse"""
+        with pytest.raises(SystemExit):
+            parse_args(['--prompt'])
+
+        assert 'expected one argument' in capsys.readouterr().err
+
+    def test_abbreviation_falls_back_to_argparse(self):
+        """Test argparse-style prefix abbreviations still work"""
+        args = parse_args(['--prom', 'hello'])
+
+        assert args.prompt == 'hello'
+
+
+class TestParseStdinJson:
+    """Test suite for parse_stdin_json, run with json.load and with ijson"""
+
+    @pytest.fixture(params=['json', 'ijson'])
+    def parse(self, request, monkeypatch):
+        """Parse a payload from stdin through one of the two code paths"""
+        if request.param == 'ijson':
+            monkeypatch.setattr(memory_trigger, 'ijson', pytest.importorskip('ijson'))
+        else:
+            monkeypatch.setattr(memory_trigger, 'ijson', None)
+
+        def parse(payload):
+            stdin = io.TextIOWrapper(io.BytesIO(payload.encode('utf-8')), encoding='utf-8')
+            monkeypatch.setattr(sys, 'stdin', stdin)
+            return memory_trigger.parse_stdin_json()
+        return parse
+
+    @pytest.mark.parametrize("payload, expected", [
+        ('{"session_id": "s1", "user_prompt": "hello", "cwd": "/x"}', 'hello'),
+        ('{"user_prompt": "caf\\u00e9 \\ud83d\\ude00"}', 'caf\u00e9 \U0001f600'),
+        ('{"history": [{"user_prompt": "old"}], "meta": {"user_prompt": "nested"}, '
+         '"user_prompt": "new"}', 'new'),
+        ('{"session_id": "s1"}', ''),
+        ('{"user_prompt": null}', None),
+        ('{"user_prompt": 5}', 5),
+        ('{"user_prompt": 2.5}', 2.5),
+        ('{"user_prompt": true}', True),
+        ('{"user_prompt": {"text": ["a", {"b": 1}]}, "after": 1}', {'text': ['a', {'b': 1}]}),
+        ('{"user_prompt": []}', []),
+    ], ids=['string', 'unicode', 'nested-keys-ignored', 'missing', 'null', 'int', 'float',
+            'bool', 'object', 'empty-array'])
+    def test_prompt_value(self, parse, payload, expected):
+        """Test both paths return the top-level user_prompt as json.load gives it"""
+        result = parse(payload)
+
+        assert result == expected
+        assert type(result) is type(expected)
+
+    @pytest.mark.parametrize("payload", [
+        '["user_prompt"]',
+        '"user_prompt"',
+        '42',
+        '{"user_prompt": ',
+        '',
+    ], ids=['array', 'string', 'number', 'truncated', 'empty'])
+    def test_invalid_payload(self, parse, payload, capsys):
+        """Test both paths reject non-object and malformed payloads"""
+        assert parse(payload) is None
+        assert 'Failed to parse stdin JSON' in capsys.readouterr().err
@@ -11,6 +11,9 @@ Date: 2025-12-29
 import pytest
 import sys
 import json
+import logging
+import copy
+import pickle
 import tempfile
 from pathlib import Path
 from unittest.mock import Mock, patch, MagicMock, mock_open
@@ -20,7 +23,7 @@ from datetime import datetime
 scripts_dir = Path(__file__).parent.parent
 sys.path.insert(0, str(scripts_dir))
 
-from memory_trigger_engine import MemoryTriggerEngine
+from memory_trigger_engine import MemoryTriggerEngine, MAX_TRIGGER_HISTORY
 from memory_detectors import MemoryDetector, TriggerResult, DetectorRegistry
 from memory_client import MemoryClient
 
@@ -133,12 +136,26 @@ class TestMemoryTriggerEngine:
         assert 'detectors' in engine.config
 
     def test_initialization_creates_memory_client(self, tmp_path):
-        """Test initialization creates MemoryClient instance"""
+        """Test memory client is created on first access, then reused"""
         with patch('pathlib.Path.home', return_value=tmp_path):
             with patch.object(MemoryTriggerEngine, '_initialize_detectors'):
                 engine = MemoryTriggerEngine()
 
+        assert engine._memory_client is None
         assert isinstance(engine.memory_client, MemoryClient)
+        assert engine.memory_client is engine.memory_client
+
+    def test_stats_only_engine_is_complete_without_log_file(self, tmp_path):
+        """Test a stats-only engine skips the log file but still evaluates prompts"""
+        with patch('pathlib.Path.home', return_value=tmp_path):
+            engine = MemoryTriggerEngine(stats_only=True)
+
+            assert engine.get_stats()['tokens_remaining'] == engine._max_tokens
+            engine.evaluate_triggers('hello')
+            engine.logger.warning('not written anywhere')
+
+        assert all(isinstance(h, logging.NullHandler) for h in engine.logger.handlers)
+        assert not (tmp_path / ".claude" / "memory-trigger.log").exists()
 
     def test_initialization_creates_detector_registry(self, tmp_path):
         """Test initialization creates DetectorRegistry"""
@@ -308,6 +325,24 @@ class TestMemoryTriggerEngine:
         # Logger should have been called (can't easily test log contents without mocking logger)
         assert hasattr(engine, 'logger')
 
+    def test_log_file_opened_only_when_record_emitted(self, tmp_path):
+        """Test the log file is not created until something is logged"""
+        config_path = tmp_path / ".claude" / "memory-trigger-config.json"
+        config_path.parent.mkdir(parents=True, exist_ok=True)
+        config_path.write_text(json.dumps({
+            "budget": {"max_tokens_per_session": 5000},
+            "logging": {"level": "INFO", "file": ".claude/memory-trigger.log"}
+        }))
+
+        with patch('pathlib.Path.home', return_value=tmp_path):
+            engine = MemoryTriggerEngine()
+
+        log_file = tmp_path / ".claude" / "memory-trigger.log"
+        assert not log_file.exists()
+
+        engine.logger.info("first record")
+        assert log_file.exists()
+
     # ========== Manual Registration Tests ==========
 
     def test_manual_registration_adds_detector(self, tmp_path):
@@ -344,7 +379,7 @@ class TestMemoryTriggerEngine:
         engine.register_detector(custom_detector)
 
         # Should have only one keyword_detector (the custom one)
-        detectors = [d for d in engine.registry._detectors if d.name == 'keyword_detector']
+        detectors = [d for d in engine.registry._by_name.values() if d.name == 'keyword_detector']
         assert len(detectors) == 1
         assert detectors[0] == custom_detector
 
@@ -403,6 +438,60 @@ class TestMemoryTriggerEngine:
         assert detector_high.evaluate_count == 1
         assert detector_low.evaluate_count == 0
 
+    def test_set_enabled_updates_enabled_detectors(self, tmp_path):
+        """Test toggling a registered detector skips it until re-enabled"""
+        with patch('pathlib.Path.home', return_value=tmp_path):
+            with patch.object(MemoryTriggerEngine, '_initialize_detectors'):
+                engine = MemoryTriggerEngine()
+
+        detector1 = MockDetector({'enabled': True, 'priority': 1}, detector_name="detector1")
+        detector2 = MockDetector({'enabled': True, 'priority': 2}, detector_name="detector2")
+        engine.register_detector(detector1)
+        engine.register_detector(detector2)
+        assert engine.registry.get_enabled_detectors() == (detector1, detector2)
+
+        assert engine.registry.set_enabled("detector1", False) is True
+        engine.evaluate_triggers("test prompt")
+        assert detector1.evaluate_count == 0
+        assert detector2.evaluate_count == 1
+
+        engine.registry.set_enabled("detector1", True)
+        assert engine.registry.get_enabled_detectors() == (detector1, detector2)
+        assert engine.registry.set_enabled("missing", True) is False
+
+    def test_lazy_detector_created_only_when_reached(self, tmp_path):
+        """Test a lazily registered detector is not created when an earlier one triggers"""
+        with patch('pathlib.Path.home', return_value=tmp_path):
+            with patch.object(MemoryTriggerEngine, '_initialize_detectors'):
+                engine = MemoryTriggerEngine()
+
+        detector1 = MockDetector({'enabled': True, 'priority': 1}, detector_name="detector1", trigger_on_prompt="trigger")
+        detector2 = MockDetector({'enabled': True, 'priority': 2}, detector_name="detector2")
+        factory = Mock(return_value=detector2)
+        engine.register_detector(detector1)
+        engine.registry.register_lazy("detector2", 2, factory)
+
+        assert engine.evaluate_triggers("test trigger prompt") is not None
+        factory.assert_not_called()
+
+        assert engine.evaluate_triggers("test prompt") is None
+        factory.assert_called_once()
+        assert detector2.evaluate_count == 1
+        assert engine.registry.get_detector("detector2") is detector2
+
+    def test_lazy_detector_dropped_when_factory_fails(self, tmp_path):
+        """Test a lazily registered detector that can't be loaded is removed"""
+        with patch('pathlib.Path.home', return_value=tmp_path):
+            with patch.object(MemoryTriggerEngine, '_initialize_detectors'):
+                engine = MemoryTriggerEngine()
+
+        engine.registry.register_lazy("broken", 1, Mock(return_value=None))
+        assert len(engine.registry) == 1
+
+        assert engine.evaluate_triggers("test prompt") is None
+        assert len(engine.registry) == 0
+        assert engine.registry.get_detector("broken") is None
+
     def test_evaluate_triggers_returns_none_when_no_match(self, tmp_path):
         """Test returns None when no detectors trigger"""
         with patch('pathlib.Path.home', return_value=tmp_path):
@@ -631,6 +720,90 @@ class TestMemoryTriggerEngine:
 
         saved_state = json.loads(state_path.read_text())
         assert saved_state['test_key'] == 'test_value'
+        assert not list(state_path.parent.glob('*.tmp'))
+
+    def test_save_state_uses_a_private_temp_file(self, tmp_path):
+        """Test concurrent saves can't collide on a shared temp file"""
+        with patch('pathlib.Path.home', return_value=tmp_path):
+            with patch.object(MemoryTriggerEngine, '_initialize_detectors'):
+                engine = MemoryTriggerEngine()
+
+        # Another process's temp file, mid-write, at the old fixed name
+        state_path = tmp_path / ".claude" / "memory-trigger-state.json"
+        other_temp = state_path.with_suffix('.tmp')
+        other_temp.write_text('{"session_id": "other"')
+
+        engine.state['test_key'] = 'test_value'
+        engine._save_state()
+
+        assert json.loads(state_path.read_text())['test_key'] == 'test_value'
+        assert other_temp.read_text() == '{"session_id": "other"'
+        assert list(state_path.parent.glob('*.tmp')) == [other_temp]
+
+    def test_save_state_failure_removes_temp_file(self, tmp_path, capsys):
+        """Test a failed replace reports a warning and leaves no temp file"""
+        with patch('pathlib.Path.home', return_value=tmp_path):
+            with patch.object(MemoryTriggerEngine, '_initialize_detectors'):
+                engine = MemoryTriggerEngine()
+
+        with patch('memory_trigger_engine.os.replace', side_effect=OSError('disk full')):
+            engine._save_state()
+
+        assert 'Failed to save state: disk full' in capsys.readouterr().out
+        assert not list((tmp_path / ".claude").glob('*.tmp'))
+
+    def test_save_state_creates_missing_directory(self, tmp_path):
+        """Test _save_state() creates the state directory when it is missing"""
+        with patch('pathlib.Path.home', return_value=tmp_path):
+            with patch.object(MemoryTriggerEngine, '_initialize_detectors'):
+                engine = MemoryTriggerEngine()
+
+        engine.state_path = tmp_path / "new-dir" / "memory-trigger-state.json"
+        engine._save_state()
+
+        assert json.loads(engine.state_path.read_text())['session_id'] == engine.state['session_id']
+
+    def test_record_trigger_keeps_recent_history_and_total_count(self, tmp_path):
+        """Test _record_trigger() bounds triggers_fired but counts every trigger"""
+        with patch('pathlib.Path.home', return_value=tmp_path):
+            with patch.object(MemoryTriggerEngine, '_initialize_detectors'):
+                engine = MemoryTriggerEngine()
+
+        trigger_result = TriggerResult(
+            triggered=True,
+            confidence=0.9,
+            estimated_tokens=1,
+            query_type="keyword_search",
+            query_params={"query": "test"},
+            reason="Test trigger"
+        )
+        with patch.object(engine, '_save_state'):
+            for i in range(MAX_TRIGGER_HISTORY + 10):
+                engine._record_trigger(trigger_result, actual_tokens=i)
+
+        assert len(engine.state['triggers_fired']) == MAX_TRIGGER_HISTORY
+        assert engine.state['triggers_fired'][-1]['tokens'] == MAX_TRIGGER_HISTORY + 9
+        assert engine.state['triggers_count'] == MAX_TRIGGER_HISTORY + 10
+        assert engine.get_stats()['triggers_fired'] == MAX_TRIGGER_HISTORY + 10
+
+    def test_load_state_migrates_unbounded_trigger_history(self, tmp_path):
+        """Test _load_state() seeds triggers_count from and trims an old history"""
+        state_path = tmp_path / ".claude" / "memory-trigger-state.json"
+        state_path.parent.mkdir(parents=True)
+        state_path.write_text(json.dumps({
+            "session_id": "old-session",
+            "session_start": "2025-01-01T00:00:00",
+            "tokens_used": 0,
+            "triggers_fired": [{'tokens': i} for i in range(MAX_TRIGGER_HISTORY + 50)]
+        }))
+
+        with patch('pathlib.Path.home', return_value=tmp_path):
+            with patch.object(MemoryTriggerEngine, '_initialize_detectors'):
+                engine = MemoryTriggerEngine()
+
+        assert engine.state['triggers_count'] == MAX_TRIGGER_HISTORY + 50
+        assert len(engine.state['triggers_fired']) == MAX_TRIGGER_HISTORY
+        assert engine.state['triggers_fired'][-1] == {'tokens': MAX_TRIGGER_HISTORY + 49}
 
     def test_record_trigger_updates_state(self, tmp_path):
         """Test _record_trigger() updates tokens and fires list"""
@@ -802,3 +975,30 @@ class TestMemoryTriggerEngine:
         assert 'Obs 0' in output
         assert 'Obs 2' in output
         assert 'Obs 9' not in output  # Should be truncated
+
+
+class TestTriggerResult:
+    """Test suite for TriggerResult"""
+
+    @pytest.mark.parametrize("round_trip", [
+        copy.copy,
+        copy.deepcopy,
+        lambda result: pickle.loads(pickle.dumps(result)),
+    ], ids=['copy', 'deepcopy', 'pickle'])
+    def test_round_trip(self, round_trip):
+        """Test frozen slotted results survive copying and pickling"""
+        result = TriggerResult(
+            triggered=True,
+            confidence=0.9,
+            estimated_tokens=150,
+            query_type="keyword_search",
+            query_params={"query": "test query"},
+            reason="Test"
+        )
+
+        restored = round_trip(result)
+
+        assert restored == result
+        assert restored is not result
+        with pytest.raises(AttributeError):
+            restored.confidence = 0.1
@@ -88,7 +88,7 @@ class TestProjectSwitchDetector:
 
         assert detector.priority == 5
         assert detector.detect_branch_switch is False
-        assert detector.major_branches == ['production', 'staging']
+        assert detector.major_branches == frozenset(['production', 'staging'])
 
     def test_priority_defaults_to_one_when_missing(self):
         """Test priority defaults to 1 (highest) when not specified"""
@@ -12,7 +12,7 @@ This script:
 import json
 import os
 import re
-from datetime import datetime
+import time
 from pathlib import Path
 from typing import Optional, List, Tuple
 
@@ -138,7 +138,7 @@ class ClaudeMdUpdater:
         lines = []
         lines.append("## Current Session State")
         lines.append("")
-        lines.append(f"**Last Updated:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        lines.append(f"**Last Updated:** {time.strftime('%Y-%m-%d %H:%M:%S')}")
         lines.append(f"**Session ID:** {checkpoint.get('session_id', 'N/A')}")
         lines.append("")
 
@@ -264,7 +264,7 @@ class ClaudeMdUpdater:
 **Last Updated:** {timestamp}
 
 No active session. Start a new session to track progress.
-""".format(timestamp=datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+""".format(timestamp=time.strftime('%Y-%m-%d %H:%M:%S'))
 
         content = self.update_section(content, "Current Session State", cleared_section)
         self.write_claude_md(content)
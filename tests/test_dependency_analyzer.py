@@ -12,14 +12,20 @@ Tests the core functionality of cross-file dependency tracking including:
 import unittest
 import tempfile
 import shutil
+import sqlite3
 from pathlib import Path
 import sys
 import os
+from unittest.mock import patch
 
 # Add scripts directory to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
 
-from dependency_analyzer import DependencyAnalyzer, FileDependency
+import dependency_analyzer
+from dependency_analyzer import (
+    DependencyAnalyzer, FileDependency, PARALLEL_SCAN_MIN_FILES,
+    _prefetch_sources, _regex_imported_modules, get_dependencies_summary
+)
 
 
 class TestDependencyAnalyzer(unittest.TestCase):
@@ -84,6 +90,145 @@ def world():
         self.assertGreaterEqual(dep.impact_score, 50)
         self.assertLessEqual(dep.impact_score, 70)
 
+    def test_package_reverse_dependencies(self):
+        """Test that importers of a changed package __init__ are found"""
+        self.create_test_file('pkg/__init__.py', 'VALUE = 1')
+        self.create_test_file('user.py', 'import pkg')
+        self.create_test_file('other.py', 'import json')
+
+        analyzer = DependencyAnalyzer(
+            base_dir=self.test_dir,
+            changed_files=['pkg/__init__.py'],
+            use_cache=False
+        )
+        dependencies = analyzer.analyze_dependencies()
+
+        dep = dependencies[str(Path('pkg') / '__init__.py')]
+        self.assertEqual(dep.used_by, ('user.py',))
+
+    def test_large_reverse_dependency_scan(self):
+        """Test reverse deps on a project big enough for the parallel scan"""
+        self.create_test_file('core.py', 'def run(): pass')
+        for i in range(PARALLEL_SCAN_MIN_FILES):
+            content = 'import core' if i % 4 == 0 else 'import json'
+            self.create_test_file(f'mod{i}.py', content)
+
+        analyzer = DependencyAnalyzer(
+            base_dir=self.test_dir,
+            changed_files=['core.py'],
+            use_cache=False
+        )
+        dependencies = analyzer.analyze_dependencies()
+
+        self.assertEqual(dependencies['core.py'].used_by_count,
+                         PARALLEL_SCAN_MIN_FILES // 4)
+        # Importers are reported in a stable (sorted) order
+        used_by = dependencies['core.py'].used_by
+        self.assertEqual(list(used_by), sorted(used_by))
+
+    def test_reverse_scan_skips_environment_dirs(self):
+        """Test virtualenvs, .git and node_modules are not scanned for importers"""
+        self.create_test_file('core.py', 'def run(): pass')
+        self.create_test_file('app.py', 'import core')
+        self.create_test_file('.venv/pyvenv.cfg', 'home = /usr/bin')
+        self.create_test_file('.venv/lib/vendored.py', 'import core')
+        self.create_test_file('node_modules/pkg/tool.py', 'import core')
+        self.create_test_file('.git/hooks/hook.py', 'import core')
+
+        analyzer = DependencyAnalyzer(
+            base_dir=self.test_dir,
+            changed_files=['core.py'],
+            use_cache=False
+        )
+        dependencies = analyzer.analyze_dependencies()
+
+        self.assertEqual(dependencies['core.py'].used_by, ('app.py',))
+
+    def test_reverse_scan_keeps_source_dirs_with_tool_names(self):
+        """Test ordinary directories named like build output or venvs are scanned"""
+        self.create_test_file('core.py', 'def run(): pass')
+        self.create_test_file('env/settings.py', 'import core')
+        self.create_test_file('venv/__init__.py', 'import core')
+        self.create_test_file('build/steps.py', 'import core')
+        self.create_test_file('dist/release.py', 'import core')
+        self.create_test_file('.github/scripts/ci.py', 'import core')
+
+        analyzer = DependencyAnalyzer(
+            base_dir=self.test_dir,
+            changed_files=['core.py'],
+            use_cache=False
+        )
+        dependencies = analyzer.analyze_dependencies()
+
+        self.assertEqual(
+            dependencies['core.py'].used_by,
+            tuple(sorted(str(Path(p)) for p in (
+                '.github/scripts/ci.py', 'build/steps.py', 'dist/release.py',
+                'env/settings.py', 'venv/__init__.py')))
+        )
+
+    def test_large_changeset_analysis(self):
+        """Test analyzing enough changed files to use the process pool"""
+        self.create_test_file('core.py', 'def run(): pass')
+        self.create_test_file('broken.py', 'def broken(:\n')
+        changed = ['broken.py']
+        for i in range(PARALLEL_SCAN_MIN_FILES):
+            self.create_test_file(f'mod{i}.py', 'import core\ncore.run()')
+            changed.append(f'mod{i}.py')
+
+        analyzer = DependencyAnalyzer(
+            base_dir=self.test_dir,
+            changed_files=changed,
+            use_cache=False
+        )
+        dependencies = analyzer.analyze_dependencies()
+
+        self.assertEqual(analyzer.files_analyzed, len(changed))
+        self.assertEqual(dependencies['mod0.py'].imports_from, ('core.py',))
+        self.assertEqual(dependencies['mod0.py'].function_calls_to, ('core.run',))
+        self.assertEqual(dependencies['broken.py'].imports_from, ())
+
+    def test_regex_import_extraction(self):
+        """Test the parse-free import extraction used by the reverse scan"""
+        source = """
+import os, json as j
+import pkg.sub as alias  # comment
+from .relative import thing
+from . import sibling
+from util.helpers import (
+    a,
+    b,
+)
+    import nested
+x = "not an import"
+"""
+        self.assertEqual(
+            _regex_imported_modules(source),
+            {'os', 'json', 'pkg.sub', 'relative', 'util.helpers', 'nested'}
+        )
+
+    def test_regex_import_extraction_ambiguous_syntax(self):
+        """Test import layouts the line regex misreads fall back to ast"""
+        cases = {
+            'semicolon': ("import a; import b\nfrom c import d; import e\n",
+                          {'a', 'b', 'c', 'e'}),
+            'compound statement': ("if x: import y\ntry: from z import w\nexcept ImportError: pass\n",
+                                   {'y', 'z'}),
+            'backslash continuation': ("import a, \\\n    b\n", {'a', 'b'}),
+            'parenthesized': ("from pkg import (\n    one,\n    two as three,\n)\n", {'pkg'}),
+            'docstring': ('"""\nUsage:\nimport fake_doc\n"""\nimport real\n', {'real'}),
+            'multi-line string': ("X = '''\nfrom fake_str import y\n'''\nimport real\n", {'real'}),
+        }
+        for name, (source, expected) in cases.items():
+            with self.subTest(name):
+                self.assertEqual(_regex_imported_modules(source), expected)
+
+    def test_regex_import_extraction_unparseable_ambiguous_file(self):
+        """Test an ambiguous file that doesn't parse still gets the regex result"""
+        source = "import a; import b\ndef broken(:\n"
+
+        self.assertEqual(_regex_imported_modules(source), {'a'})
+
     def test_cache_functionality(self):
         """Test that caching works correctly"""
         self.create_test_file('cached.py', 'def test(): pass')
@@ -112,6 +257,34 @@ def world():
         self.assertEqual(dependencies1['cached.py'].file_path,
                         dependencies2['cached.py'].file_path)
 
+    def test_cache_connection_closed(self):
+        """Test the cache connection is closed after a run and on leaving a with block"""
+        self.create_test_file('cached.py', 'def test(): pass')
+
+        analyzer = DependencyAnalyzer(
+            base_dir=self.test_dir,
+            changed_files=['cached.py'],
+            use_cache=True
+        )
+        db = analyzer.cache_db
+        analyzer.analyze_dependencies()
+        self.assertIsNone(analyzer.cache_db)
+        with self.assertRaises(sqlite3.ProgrammingError):
+            db.execute("SELECT 1")
+
+        # A second run on the same analyzer reopens the cache
+        analyzer.analyze_dependencies()
+        self.assertEqual(analyzer.cache_hits, 1)
+        self.assertIsNone(analyzer.cache_db)
+
+        # Unused analyzers are closed by the with block
+        with DependencyAnalyzer(base_dir=self.test_dir, changed_files=[]) as unused:
+            db = unused.cache_db
+            self.assertIsNotNone(db)
+        self.assertIsNone(unused.cache_db)
+        with self.assertRaises(sqlite3.ProgrammingError):
+            db.execute("SELECT 1")
+
     def test_cache_invalidation_on_file_change(self):
         """Test that cache is invalidated when file changes"""
         filepath = self.create_test_file('modified.py', 'def v1(): pass')
@@ -139,6 +312,109 @@ def world():
         analyzer2.analyze_dependencies()
         self.assertEqual(analyzer2.cache_misses, 1)
 
+    def test_cache_survives_mtime_only_change(self):
+        """Test that touching a file without changing it keeps the cache valid"""
+        filepath = self.create_test_file('touched.py', 'def same(): pass')
+
+        analyzer1 = DependencyAnalyzer(
+            base_dir=self.test_dir,
+            changed_files=['touched.py'],
+            use_cache=True
+        )
+        analyzer1.analyze_dependencies()
+
+        # Simulate a git checkout resetting the mtime
+        stat = filepath.stat()
+        os.utime(filepath, (stat.st_atime, stat.st_mtime + 60))
+
+        analyzer2 = DependencyAnalyzer(
+            base_dir=self.test_dir,
+            changed_files=['touched.py'],
+            use_cache=True
+        )
+        analyzer2.analyze_dependencies()
+        self.assertEqual(analyzer2.cache_hits, 1)
+        self.assertEqual(analyzer2.cache_misses, 0)
+
+    def test_cached_reverse_scan_picks_up_modified_importers(self):
+        """Test the persisted reverse scan rescans files whose mtime changed"""
+        core = self.create_test_file('core.py', 'def run(): pass')
+        self.create_test_file('a.py', 'import core')
+        b = self.create_test_file('b.py', 'import json')
+
+        analyzer1 = DependencyAnalyzer(
+            base_dir=self.test_dir,
+            changed_files=['core.py'],
+            use_cache=True
+        )
+        self.assertEqual(analyzer1.analyze_dependencies()['core.py'].used_by, ('a.py',))
+
+        b.write_text('import core', encoding='utf-8')
+        core.write_text('def run(): return 1', encoding='utf-8')
+        for filepath in (b, core):
+            stat = filepath.stat()
+            os.utime(filepath, (stat.st_atime, stat.st_mtime + 60))
+
+        analyzer2 = DependencyAnalyzer(
+            base_dir=self.test_dir,
+            changed_files=['core.py'],
+            use_cache=True
+        )
+        self.assertEqual(analyzer2.analyze_dependencies()['core.py'].used_by,
+                         ('a.py', 'b.py'))
+
+    def test_cached_reverse_scan_rescreens_for_new_changed_modules(self):
+        """Test a file screened out for one change is found for another"""
+        self.create_test_file('core.py', 'def run(): pass')
+        self.create_test_file('other.py', 'def go(): pass')
+        self.create_test_file('a.py', 'import core')
+        self.create_test_file('b.py', 'import other')
+
+        analyzer1 = DependencyAnalyzer(
+            base_dir=self.test_dir,
+            changed_files=['core.py'],
+            use_cache=True
+        )
+        self.assertEqual(analyzer1.analyze_dependencies()['core.py'].used_by, ('a.py',))
+
+        analyzer2 = DependencyAnalyzer(
+            base_dir=self.test_dir,
+            changed_files=['other.py'],
+            use_cache=True
+        )
+        self.assertEqual(analyzer2.analyze_dependencies()['other.py'].used_by, ('b.py',))
+
+        analyzer3 = DependencyAnalyzer(
+            base_dir=self.test_dir,
+            changed_files=['core.py'],
+            use_cache=True
+        )
+        self.assertEqual(analyzer3.analyze_dependencies()['core.py'].used_by, ('a.py',))
+
+    def test_cached_reverse_scan_skips_unrelated_files(self):
+        """Test with the cache on, files not naming a changed module aren't scanned"""
+        self.create_test_file('core.py', 'def run(): pass')
+        self.create_test_file('app.py', 'import core')
+        self.create_test_file('unrelated.py', 'import json')
+
+        def analyze():
+            analyzer = DependencyAnalyzer(
+                base_dir=self.test_dir,
+                changed_files=['core.py'],
+                use_cache=True
+            )
+            self.assertIsNotNone(analyzer.cache_db)
+            with patch('dependency_analyzer._regex_imported_modules',
+                       wraps=dependency_analyzer._regex_imported_modules) as scan:
+                dependencies = analyzer.analyze_dependencies()
+            self.assertEqual(dependencies['core.py'].used_by, ('app.py',))
+            return [call.args[0] for call in scan.call_args_list]
+
+        # Cold cache: only the file that mentions core is scanned
+        self.assertEqual(analyze(), ['import core'])
+        # Warm cache: nothing is scanned again
+        self.assertEqual(analyze(), [])
+
     def test_test_file_detection(self):
         """Test that test file detection works"""
         self.create_test_file('module.py', 'def function(): pass')
@@ -154,6 +430,51 @@ def world():
         dep = dependencies['module.py']
         self.assertTrue(dep.has_tests)
 
+    def test_test_file_detection_outside_project_index(self):
+        """Test test files are found even in directories the project walk prunes"""
+        self.create_test_file('node_modules/tool/helper.py', 'def function(): pass')
+        self.create_test_file('node_modules/tool/test_helper.py', 'import helper')
+        self.create_test_file('lib.py', 'def function(): pass')
+        self.create_test_file('tests/test_lib.py', 'import lib')
+
+        analyzer = DependencyAnalyzer(
+            base_dir=self.test_dir,
+            changed_files=['node_modules/tool/helper.py', 'lib.py'],
+            use_cache=False
+        )
+        dependencies = analyzer.analyze_dependencies()
+
+        self.assertTrue(dependencies[str(Path('node_modules/tool/helper.py'))].has_tests)
+        self.assertTrue(dependencies['lib.py'].has_tests)
+
+    def test_test_file_detection_lists_each_directory_once(self):
+        """Test every test layout is found with one listdir per directory"""
+        layouts = {
+            'pkg/a.py': 'pkg/test_a.py',
+            'pkg/b.py': 'pkg/b_test.py',
+            'pkg/c.py': 'pkg/tests/test_c.py',
+            'pkg/d.py': 'pkg/test/test_d.py',
+            'pkg/e.py': 'tests/test_e.py',
+            'pkg/f.py': None,
+        }
+        for source, test in layouts.items():
+            self.create_test_file(source, 'def function(): pass')
+            if test:
+                self.create_test_file(test, 'pass')
+
+        analyzer = DependencyAnalyzer(
+            base_dir=self.test_dir,
+            changed_files=list(layouts),
+            use_cache=False
+        )
+        with patch('dependency_analyzer.os.listdir', wraps=os.listdir) as listdir:
+            dependencies = analyzer.analyze_dependencies()
+
+        for source, test in layouts.items():
+            self.assertEqual(dependencies[str(Path(source))].has_tests, bool(test), source)
+        listed = [call.args[0] for call in listdir.call_args_list]
+        self.assertEqual(len(listed), len(set(listed)))
+
     def test_no_test_file(self):
         """Test files without tests are marked correctly"""
         self.create_test_file('no_tests.py', 'def function(): pass')
@@ -229,6 +550,17 @@ def broken(
         # Both should be misses
         self.assertEqual(analyzer2.cache_hits, 0)
 
+    def test_prefetch_preserves_order(self):
+        """Test that prefetched sources come back in input order"""
+        paths = [self.create_test_file(f'mod{i}.py', f'x = {i}') for i in range(20)]
+        paths.append(self.test_dir / 'missing.py')
+
+        results = list(_prefetch_sources(paths, depth=2))
+
+        self.assertEqual([p for p, _ in results], paths)
+        self.assertEqual(results[3][1], 'x = 3')
+        self.assertIsNone(results[-1][1])
+
 
 class TestFileDependency(unittest.TestCase):
     """Test cases for FileDependency dataclass"""
@@ -252,6 +584,43 @@ class TestFileDependency(unittest.TestCase):
         self.assertEqual(dep.impact_score, 50)
 
 
+class TestDependenciesSummary(unittest.TestCase):
+    """Test cases for get_dependencies_summary"""
+
+    def make_dep(self, path: str, score: int, has_tests: bool) -> FileDependency:
+        return FileDependency(
+            file_path=path,
+            imports_from=[],
+            used_by=[],
+            used_by_count=0,
+            function_calls_to=[],
+            has_tests=has_tests,
+            impact_score=score
+        )
+
+    def test_empty_summary(self):
+        """Test summary of no dependencies"""
+        summary = get_dependencies_summary({})
+        self.assertEqual(summary['total_files'], 0)
+        self.assertEqual(summary['avg_impact_score'], 0)
+
+    def test_summary_statistics(self):
+        """Test counts, average and high-impact file list"""
+        deps = {
+            f'f{i}.py': self.make_dep(f'f{i}.py', score, i % 2 == 0)
+            for i, score in enumerate([90, 10, 70, 30, 80, 75, 95, 100])
+        }
+
+        summary = get_dependencies_summary(deps)
+
+        self.assertEqual(summary['total_files'], 8)
+        self.assertEqual(summary['high_impact_count'], 6)
+        self.assertEqual(summary['files_with_tests'], 4)
+        self.assertEqual(summary['avg_impact_score'], 68.8)
+        self.assertEqual(summary['high_impact_files'],
+                         ['f0.py', 'f2.py', 'f4.py', 'f5.py', 'f6.py'])
+
+
 def run_tests():
     """Run all tests"""
     suite = unittest.TestLoader().loadTestsFromModule(sys.modules[__name__])
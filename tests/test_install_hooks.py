@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Unit tests for install-hooks.py
+
+Tests that the generated post-commit hook never gets in the way of a
+commit, whatever the handler does.
+"""
+
+import unittest
+import tempfile
+import shutil
+import subprocess
+import importlib.util
+import time
+from pathlib import Path
+import os
+
+# install-hooks.py isn't importable by name (hyphen), load it from its path
+_spec = importlib.util.spec_from_file_location(
+    "install_hooks",
+    os.path.join(os.path.dirname(__file__), '..', 'scripts', 'install-hooks.py'))
+install_hooks = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(install_hooks)
+
+
+class TestPostCommitHook(unittest.TestCase):
+    """Test cases for the generated post-commit hook"""
+
+    def setUp(self):
+        """Create a temporary git repository"""
+        self.test_dir = Path(tempfile.mkdtemp())
+        self.repo = self.test_dir / "repo"
+        self.repo.mkdir()
+        self.git('init', '-q')
+        self.git('config', 'user.email', 'test@example.com')
+        self.git('config', 'user.name', 'Test')
+        self.installer = install_hooks.GitHookInstaller(self.repo)
+
+        self.original_timeout = install_hooks.HOOK_TIMEOUT_SECONDS
+        install_hooks.HOOK_TIMEOUT_SECONDS = 2
+
+    def tearDown(self):
+        """Clean up temporary repository"""
+        install_hooks.HOOK_TIMEOUT_SECONDS = self.original_timeout
+        shutil.rmtree(self.test_dir)
+
+    def git(self, *args):
+        """Run git in the test repository"""
+        return subprocess.run(['git', *args], cwd=self.repo,
+                              capture_output=True, text=True)
+
+    def install_handler(self, source: str, name: str = "handler.py") -> Path:
+        """Install a hook that runs a handler with the given source"""
+        handler = self.test_dir / name
+        handler.write_text(source)
+        return self.install_hook(self.installer._generate_hook_content(handler))
+
+    def install_hook(self, content: str) -> Path:
+        """Write the post-commit hook with the given content"""
+        hook = self.repo / ".git" / "hooks" / "post-commit"
+        hook.parent.mkdir(parents=True, exist_ok=True)
+        with open(hook, 'w', encoding='utf-8', newline='\n') as f:
+            f.write(content)
+        os.chmod(hook, install_hooks.HOOK_MODE)
+        return hook
+
+    def test_hook_exits_zero_when_handler_raises(self):
+        """Test a crashing handler doesn't fail the hook or the commit"""
+        hook = self.install_handler("raise RuntimeError('boom')\n")
+
+        result = self.git('commit', '--allow-empty', '-q', '-m', 'test')
+        self.assertEqual(result.returncode, 0)
+        self.assertEqual(self.git('rev-list', '--count', 'HEAD').stdout.strip(), '1')
+
+        hook_result = subprocess.run(['sh', str(hook)], cwd=self.repo, capture_output=True)
+        self.assertEqual(hook_result.returncode, 0)
+
+    def test_hook_bounds_a_hanging_handler(self):
+        """Test a handler that hangs is stopped and the commit finishes"""
+        self.install_handler("import time\ntime.sleep(60)\n")
+
+        start = time.monotonic()
+        result = self.git('commit', '--allow-empty', '-q', '-m', 'test')
+        elapsed = time.monotonic() - start
+
+        self.assertEqual(result.returncode, 0)
+        self.assertLess(elapsed, 20)
+        self.assertIn('timed out', result.stderr)
+
+    def test_hook_runs_succeeding_handler(self):
+        """Test a working handler's output still reaches the user"""
+        self.install_handler("print('checkpoint created')\n")
+
+        result = self.git('commit', '--allow-empty', '-m', 'test')
+
+        self.assertEqual(result.returncode, 0)
+        self.assertIn('checkpoint created', result.stdout + result.stderr)
+
+    def test_self_test_passes_with_generated_hook(self):
+        """Test --test passes with the generated hook"""
+        self.install_handler("print('checkpoint created')\n")
+        self.installer._probe_git_dir()
+
+        self.assertTrue(self.installer.test_hook())
+        self.assertEqual(self.git('rev-list', '--count', 'HEAD').stdout.strip(), '1')
+
+    def test_hook_runs_handler_with_space_in_path(self):
+        """Test the default handler path is quoted correctly"""
+        self.install_handler("print('checkpoint created')\n", name="my handler.py")
+
+        result = self.git('commit', '--allow-empty', '-m', 'test')
+
+        self.assertEqual(result.returncode, 0)
+        self.assertIn('checkpoint created', result.stdout + result.stderr)
+
+    def test_self_test_fails_for_hook_that_fails(self):
+        """Test --test reports an installed hook that lets handler failures through"""
+        handler = self.test_dir / "handler.py"
+        handler.write_text("print('checkpoint created')\n")
+        content = self.installer._generate_hook_content(handler)
+        self.install_hook(content.replace('exit 0', 'exit "$status"'))
+        self.installer._probe_git_dir()
+
+        self.assertFalse(self.installer.test_hook())
+
+    def test_self_test_fails_for_stale_hook(self):
+        """Test --test reports an installed hook that predates the handler override"""
+        handler = self.test_dir / "handler.py"
+        handler.write_text("print('checkpoint created')\n")
+        self.install_hook(f"#!/bin/sh\n# Installed by: scripts/install-hooks.py\n"
+                          f"python3 '{handler}' || true\nexit 0\n")
+        self.installer._probe_git_dir()
+
+        self.assertFalse(self.installer.test_hook())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+"""
+Unit tests for migrate-checkpoints.py
+
+Tests git metadata lookup for checkpoint project inference.
+"""
+
+import unittest
+import tempfile
+import shutil
+import subprocess
+import importlib.util
+import json
+import sys
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from unittest.mock import patch
+import os
+
+# migrate-checkpoints.py isn't importable by name (hyphen), load it from its path
+_spec = importlib.util.spec_from_file_location(
+    "migrate_checkpoints",
+    os.path.join(os.path.dirname(__file__), '..', 'scripts', 'migrate-checkpoints.py'))
+migrate_checkpoints = importlib.util.module_from_spec(_spec)
+# Registered so worker processes can unpickle _load_checkpoint
+sys.modules["migrate_checkpoints"] = migrate_checkpoints
+_spec.loader.exec_module(migrate_checkpoints)
+
+
+class TestGitInfo(unittest.TestCase):
+    """Test cases for CheckpointMigrator git lookups"""
+
+    def setUp(self):
+        """Create a temporary git repository"""
+        self.test_dir = Path(tempfile.mkdtemp())
+        self.repo = self.test_dir / "repo"
+        self.repo.mkdir()
+        self.git('init', '-q')
+        self.git('config', 'user.email', 'test@example.com')
+        self.git('config', 'user.name', 'Test')
+        self.git('checkout', '-q', '-b', 'feature')
+        self.migrator = migrate_checkpoints.CheckpointMigrator(self.test_dir / "checkpoints")
+
+    def tearDown(self):
+        """Clean up temporary repository"""
+        shutil.rmtree(self.test_dir)
+
+    def git(self, *args):
+        """Run git in the test repository"""
+        return subprocess.run(['git', *args], cwd=self.repo,
+                              capture_output=True, text=True, check=True)
+
+    def test_git_info_cached_per_directory(self):
+        """Test repeated lookups for one project run git only once"""
+        self.git('commit', '-q', '--allow-empty', '-m', 'initial')
+
+        with patch.object(migrate_checkpoints.subprocess, 'run',
+                          wraps=subprocess.run) as run:
+            first = self.migrator._get_git_info(self.repo)
+            calls = run.call_count
+            second = self.migrator._get_git_info(self.repo / "sub" / "..")
+
+        self.assertEqual(first, second)
+        self.assertEqual(run.call_count, calls)
+        self.assertEqual(first['branch'], 'feature')
+
+    def test_git_info_reads_head_and_branch(self):
+        """Test a repository with commits reports HEAD and its branch"""
+        self.git('commit', '-q', '--allow-empty', '-m', 'initial')
+        head = self.git('rev-parse', 'HEAD').stdout.strip()
+
+        git_info = self.migrator._query_git_info(self.repo)
+
+        self.assertEqual(git_info, {'head_hash': head, 'branch': 'feature'})
+
+    def test_git_info_detached_head_has_empty_branch(self):
+        """Test a detached HEAD reports an empty branch"""
+        self.git('commit', '-q', '--allow-empty', '-m', 'initial')
+        self.git('checkout', '-q', '--detach')
+
+        git_info = self.migrator._query_git_info(self.repo)
+
+        self.assertEqual(git_info['branch'], '')
+
+    def test_git_info_unborn_head_reports_branch(self):
+        """Test a repository without commits still reports its branch"""
+        self.git('remote', 'add', 'origin', 'https://example.com/repo.git')
+
+        git_info = self.migrator._query_git_info(self.repo)
+
+        self.assertEqual(git_info, {'remote_url': 'https://example.com/repo.git',
+                                    'branch': 'feature'})
+        self.assertNotIn('head_hash', git_info)
+
+    def test_git_info_not_a_repository(self):
+        """Test a plain directory has no git info"""
+        plain = self.test_dir / "plain"
+        plain.mkdir()
+
+        self.assertIsNone(self.migrator._query_git_info(plain))
+
+
+class TestInferProject(unittest.TestCase):
+    """Test cases for inferring a checkpoint's project from its file changes"""
+
+    def setUp(self):
+        """Create a project directory with a few files"""
+        self.test_dir = Path(tempfile.mkdtemp()).resolve()
+        self.project = self.test_dir / "project"
+        for rel in ("src/app.py", "README.md", "foo/a.py", "foobar/b.py"):
+            (self.project / rel).parent.mkdir(parents=True, exist_ok=True)
+            (self.project / rel).write_text("")
+        self.migrator = migrate_checkpoints.CheckpointMigrator(self.test_dir / "checkpoints")
+
+    def tearDown(self):
+        """Clean up temporary directory"""
+        shutil.rmtree(self.test_dir)
+
+    def infer(self, *paths):
+        """Infer the project directory for a checkpoint touching paths"""
+        checkpoint = {'file_changes': [{'file_path': str(p)} for p in paths]}
+        metadata = self.migrator._infer_project_from_checkpoint(checkpoint)
+        return Path(metadata['absolute_path']) if metadata else None
+
+    def test_sibling_directories_sharing_a_prefix(self):
+        """Test /a/foo is not treated as an ancestor of /a/foobar"""
+        self.assertEqual(
+            self.infer(self.project / "foo/a.py", self.project / "foobar/b.py"),
+            self.project)
+
+    def test_single_file(self):
+        """Test a single file maps to its directory"""
+        self.assertEqual(self.infer(self.project / "src/app.py"), self.project / "src")
+
+    def test_files_in_removed_subdirectory(self):
+        """Test files in a since-removed subdirectory don't move the project"""
+        self.assertEqual(
+            self.infer(self.project / "src/app.py", self.project / "README.md",
+                       self.project / "old/gone.py"),
+            self.project)
+
+    def test_only_files_in_removed_subdirectory(self):
+        """Test a checkpoint whose directory is gone can't be placed"""
+        self.assertIsNone(self.infer(self.project / "old/a.py", self.project / "old/b.py"))
+
+    def test_deleted_files_in_existing_directory(self):
+        """Test deleted files still map to their directory if it remains"""
+        self.assertEqual(
+            self.infer(self.project / "deleted.py", self.project / "src/deleted.py"),
+            self.project)
+
+    def test_stale_path_outside_project(self):
+        """Test a moved file outside the project doesn't pull the project up"""
+        self.assertEqual(
+            self.infer(self.project / "src/app.py", self.project / "README.md",
+                       self.test_dir / "elsewhere/moved.py"),
+            self.project)
+
+    def test_paths_on_different_drives(self):
+        """Test paths without a common root give no project"""
+        with patch.object(migrate_checkpoints.os.path, 'commonpath',
+                          side_effect=ValueError("Paths don't have the same drive")):
+            self.assertIsNone(self.infer(self.project / "src/app.py", self.project / "README.md"))
+
+
+class FakePool:
+    """In-process stand-in for ProcessPoolExecutor that can break mid-run"""
+
+    def __init__(self, max_workers=None, fail_after=None):
+        self.fail_after = fail_after
+        self.submitted = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def submit(self, fn, *args):
+        self.submitted += 1
+        future = Future()
+        if self.fail_after is not None and self.submitted > self.fail_after:
+            future.set_exception(BrokenProcessPool('worker died'))
+        else:
+            future.set_result(fn(*args))
+        return future
+
+
+class TestMigrateAll(unittest.TestCase):
+    """Test cases for loading and migrating many checkpoints"""
+
+    TO_MIGRATE = 30
+    ALREADY_MIGRATED = 9
+
+    def setUp(self):
+        """Create a project directory and a checkpoints directory"""
+        self.test_dir = Path(tempfile.mkdtemp())
+        self.project = self.test_dir / "project"
+        (self.project / "src").mkdir(parents=True)
+        self.checkpoints = self.test_dir / "checkpoints"
+        self.checkpoints.mkdir()
+
+        for i in range(self.TO_MIGRATE):
+            self.write_checkpoint(f"checkpoint-a{i:03}.json", {
+                'file_changes': [{'file_path': str(self.project / "src" / "app.py")},
+                                 {'file_path': str(self.project / "README.md")}],
+            })
+        for i in range(self.ALREADY_MIGRATED):
+            self.write_checkpoint(f"checkpoint-b{i:03}.json", {'project': {'name': 'done'}})
+        (self.checkpoints / "checkpoint-c000.json").write_text('{not json')
+
+        self.files = sorted(self.checkpoints.glob("checkpoint-*.json"))
+        self.assertGreaterEqual(len(self.files), migrate_checkpoints.PARALLEL_LOAD_MIN_FILES)
+
+    def tearDown(self):
+        """Clean up temporary directories"""
+        shutil.rmtree(self.test_dir)
+
+    def write_checkpoint(self, name, checkpoint):
+        """Write a checkpoint JSON file"""
+        (self.checkpoints / name).write_text(json.dumps(checkpoint))
+
+    def migrate(self):
+        """Dry-run a migration of every checkpoint, returning its stats"""
+        migrator = migrate_checkpoints.CheckpointMigrator(self.checkpoints)
+        with patch('builtins.print'):
+            return migrator.migrate_all(dry_run=True)
+
+    def assert_stats(self, stats):
+        """Check every checkpoint was handled exactly once"""
+        self.assertEqual(stats, {'migrated': self.TO_MIGRATE,
+                                 'skipped': self.ALREADY_MIGRATED,
+                                 'failed': 1})
+
+    def serial_results(self):
+        """_load_checkpoint() results, comparable across processes"""
+        return [self.comparable(migrate_checkpoints._load_checkpoint(str(f)))
+                for f in self.files]
+
+    @staticmethod
+    def comparable(result):
+        """Exceptions compare by type, everything else by value"""
+        return type(result) if isinstance(result, Exception) else result
+
+    def test_migrate_all_through_pool(self):
+        """Test a large migration loads checkpoints in worker processes"""
+        with patch.object(migrate_checkpoints.os, 'cpu_count', return_value=2), \
+             patch.object(migrate_checkpoints, 'ProcessPoolExecutor',
+                          wraps=migrate_checkpoints.ProcessPoolExecutor) as pool:
+            stats = self.migrate()
+
+        pool.assert_called_once_with(max_workers=2)
+        self.assert_stats(stats)
+
+    def test_single_cpu_loads_serially(self):
+        """Test no pool is started with only one CPU"""
+        with patch.object(migrate_checkpoints.os, 'cpu_count', return_value=1), \
+             patch.object(migrate_checkpoints, 'ProcessPoolExecutor') as pool:
+            stats = self.migrate()
+
+        pool.assert_not_called()
+        self.assert_stats(stats)
+
+    def test_unavailable_pool_falls_back_to_serial(self):
+        """Test checkpoints still load when no pool can be started"""
+        with patch.object(migrate_checkpoints.os, 'cpu_count', return_value=2), \
+             patch.object(migrate_checkpoints, 'ProcessPoolExecutor',
+                          side_effect=OSError('no semaphores')):
+            stats = self.migrate()
+
+        self.assert_stats(stats)
+
+    def test_broken_pool_resumes_serially(self):
+        """Test a pool that dies mid-run neither drops nor repeats files"""
+        migrator = migrate_checkpoints.CheckpointMigrator(self.checkpoints)
+        with patch.object(migrate_checkpoints.os, 'cpu_count', return_value=2), \
+             patch.object(migrate_checkpoints, 'ProcessPoolExecutor',
+                          lambda max_workers: FakePool(max_workers, fail_after=10)):
+            results = [self.comparable(r) for r in migrator._load_checkpoints(self.files)]
+
+        self.assertEqual(results, self.serial_results())
+
+    def test_worker_exception_is_returned_not_raised(self):
+        """Test an unreadable checkpoint yields its exception in file order"""
+        migrator = migrate_checkpoints.CheckpointMigrator(self.checkpoints)
+        with patch.object(migrate_checkpoints.os, 'cpu_count', return_value=2):
+            results = list(migrator._load_checkpoints(self.files))
+
+        broken = self.files.index(self.checkpoints / "checkpoint-c000.json")
+        self.assertIsInstance(results[broken], ValueError)
+        self.assertEqual([self.comparable(r) for r in results], self.serial_results())
+
+    def test_loading_stays_a_window_ahead(self):
+        """Test at most PARALLEL_LOAD_WINDOW checkpoints are loaded ahead"""
+        pool = FakePool()
+        migrator = migrate_checkpoints.CheckpointMigrator(self.checkpoints)
+        with patch.object(migrate_checkpoints.os, 'cpu_count', return_value=2), \
+             patch.object(migrate_checkpoints, 'PARALLEL_LOAD_WINDOW', 4), \
+             patch.object(migrate_checkpoints, 'ProcessPoolExecutor',
+                          lambda max_workers: pool):
+            for consumed, _ in enumerate(migrator._load_checkpoints(self.files)):
+                self.assertLessEqual(pool.submitted, consumed + 1 + 4)
+
+        self.assertEqual(pool.submitted, len(self.files))
+
+
+if __name__ == '__main__':
+    unittest.main()